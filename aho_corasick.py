@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+from collections import deque
+from itertools import repeat
+from typing import Callable, Iterator, Sequence, Tuple
+
+import numpy as np
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher (Aho-Corasick automaton)
+    Finds every occurrence of every pattern in one pass over the text,
+    so matching cost does not grow with the number of patterns.
+    """
+    def __init__(self):
+        self.goto = [{}]  # node -> {char: child node}
+        self.fail = [0]  # node -> failure link
+        self.output = [[]]  # node -> [(pattern length, value)]
+
+    def add(self, pattern: str, value):
+        """Register a pattern; value is returned with each match"""
+        node = 0
+        for ch in pattern:
+            child = self.goto[node].get(ch)
+            if child is None:
+                child = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[node][ch] = child
+            node = child
+        self.output[node].append((len(pattern), value))
+
+    def build(self):
+        """Compute failure links (call once after all patterns are added)"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                # Longest proper suffix of this path that is also a prefix
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(ch, 0) if node else 0
+                # Inherit matches that end at the suffix node
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text: str) -> Iterator[Tuple[int, int, object]]:
+        """Yield (start, end, value) for every pattern occurrence"""
+        goto, fail, output = self.goto, self.fail, self.output
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in output[node]:
+                yield i - length + 1, i + 1, value
+
+    def compile(self, dense_depth: int = 4) -> dict:
+        """
+        Flatten the built automaton into numpy arrays (see CompiledAhoCorasick)
+        Values must be non-negative ints below 2**32. Nodes are renumbered
+        breadth-first; nodes shallower than dense_depth get a full transition
+        row (failure links folded in), deeper nodes keep sparse edges.
+        """
+        order = [0]
+        for node in order:
+            order.extend(self.goto[node].values())
+        new_id = np.empty(len(order), dtype=np.int64)
+        new_id[order] = np.arange(len(order))
+        depth = [0] * len(order)
+        for node in order:
+            for child in self.goto[node].values():
+                depth[child] = depth[node] + 1
+
+        # Character classes: 0 is any character no pattern contains
+        chars = sorted({ch for edges in self.goto for ch in edges})
+        char_class = {ch: i + 1 for i, ch in enumerate(chars)}
+        n_classes = len(chars) + 1
+
+        # Sparse edges, sorted by (node, class)
+        edge_offsets = np.zeros(len(order) + 1, dtype='<u4')
+        edge_classes, edge_targets = [], []
+        out_offsets = np.zeros(len(order) + 1, dtype='<u4')
+        out_lengths, out_values = [], []
+        for i, node in enumerate(order):
+            for cls, child in sorted((char_class[ch], c) for ch, c in self.goto[node].items()):
+                edge_classes.append(cls)
+                edge_targets.append(new_id[child])
+            edge_offsets[i + 1] = len(edge_classes)
+            for length, value in self.output[node]:
+                out_lengths.append(length)
+                out_values.append(value)
+            out_offsets[i + 1] = len(out_lengths)
+        fail = new_id[np.asarray(self.fail, dtype=np.int64)[order]].astype('<u4')
+
+        # Dense rows for the shallow nodes; a node's failure target is
+        # shallower, so its row is already complete when copied
+        n_dense = max(sum(1 for d in depth if d < dense_depth), 1)
+        delta = np.zeros((n_dense, n_classes), dtype='<u4')
+        for i in range(n_dense):
+            if i:
+                delta[i] = delta[fail[i]]
+            lo, hi = edge_offsets[i], edge_offsets[i + 1]
+            delta[i, edge_classes[lo:hi]] = edge_targets[lo:hi]
+
+        return {
+            'chars': ''.join(chars),
+            'delta': delta.ravel(),
+            'fail': fail,
+            'edge_offsets': edge_offsets,
+            'edge_classes': np.asarray(edge_classes, dtype='<u4'),
+            'edge_targets': np.asarray(edge_targets, dtype='<u4'),
+            'out_offsets': out_offsets,
+            'out_lengths': np.asarray(out_lengths, dtype='<u4'),
+            'out_values': np.asarray(out_values, dtype='<u4'),
+        }
+
+class CompiledAhoCorasick:
+    """
+    Aho-Corasick matcher over flat arrays from AhoCorasick.compile
+    The arrays can be memoryviews of a memory-mapped file, so processes
+    matching against the same file share its pages instead of each building
+    a trie. A node's matches are decoded (by the optional decode callable)
+    the first time the node is reached and cached, up to max_cached nodes.
+    """
+    def __init__(self, chars: str, delta: Sequence[int], fail: Sequence[int],
+                 edge_offsets: Sequence[int], edge_classes: Sequence[int],
+                 edge_targets: Sequence[int], out_offsets: Sequence[int],
+                 out_lengths: Sequence[int], out_values: Sequence[int],
+                 decode: Callable[[int], object] = None, max_cached: int = 100_000):
+        self.char_class = {ch: i + 1 for i, ch in enumerate(chars)}
+        self.n_classes = len(chars) + 1
+        self.n_dense = len(delta) // self.n_classes
+        self.delta = delta
+        self.fail = fail
+        self.edge_offsets = edge_offsets
+        self.edge_classes = edge_classes
+        self.edge_targets = edge_targets
+        self.out_offsets = out_offsets
+        self.out_lengths = out_lengths
+        self.out_values = out_values
+        self.decode = decode
+        self.max_cached = max_cached
+        self.outputs = {}  # Node -> ((pattern length, value), ...)
+
+    def find(self, text: str) -> Iterator[Tuple[int, int, object]]:
+        """Yield (start, end, value) for every pattern occurrence"""
+        n_classes, n_dense = self.n_classes, self.n_dense
+        delta, fail = self.delta, self.fail
+        edge_offsets, edge_classes, edge_targets = self.edge_offsets, self.edge_classes, self.edge_targets
+        out_offsets, outputs = self.out_offsets, self.outputs
+        node = 0
+        for i, cls in enumerate(map(self.char_class.get, text, repeat(0))):
+            while True:
+                if node < n_dense:
+                    node = delta[node * n_classes + cls]
+                    break
+                # Deep node: few edges, scan them, else follow the failure link
+                j, end = edge_offsets[node], edge_offsets[node + 1]
+                while j < end and edge_classes[j] != cls:
+                    j += 1
+                if j < end:
+                    node = edge_targets[j]
+                    break
+                node = fail[node]
+            if out_offsets[node] != out_offsets[node + 1]:
+                found = outputs.get(node)
+                if found is None:
+                    found = self.node_outputs(node)
+                for length, value in found:
+                    yield i - length + 1, i + 1, value
+
+    def node_outputs(self, node: int) -> tuple:
+        """Decode and cache the matches ending at node"""
+        if len(self.outputs) >= self.max_cached:
+            self.outputs.clear()
+        lo, hi = self.out_offsets[node], self.out_offsets[node + 1]
+        decode = self.decode or (lambda value: value)
+        found = tuple((self.out_lengths[k], decode(self.out_values[k])) for k in range(lo, hi))
+        self.outputs[node] = found
+        return found
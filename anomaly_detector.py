@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+import json
+import math
+import time
+from datetime import datetime, timezone
+from typing import List
+
+ALL_PLATFORMS = 'all'
+
+class SeriesStats:
+    """
+    EWMA mean/variance of hourly volume and sentiment for one ticker/platform
+    plus the running sums of the bucket in progress
+    """
+    __slots__ = ('bucket', 'count', 'sentiment_sum', 'vol_mean', 'vol_var',
+                 'sent_mean', 'sent_var', 'buckets_seen', 'sent_buckets', 'alerted')
+
+    def __init__(self, bucket: int):
+        self.bucket = bucket
+        self.count = 0
+        self.sentiment_sum = 0.0
+        self.vol_mean = 0.0
+        self.vol_var = 0.0
+        self.sent_mean = 0.0
+        self.sent_var = 0.0
+        self.buckets_seen = 0
+        self.sent_buckets = 0  # Buckets with enough posts to judge sentiment
+        self.alerted = set()  # Alert types already emitted for this bucket
+
+class StreamingAnomalyDetector:
+    """
+    Streaming per-ticker anomaly detection feeding unusual_activity_log
+    Keeps EWMA baselines of hourly volume and sentiment per (ticker, platform)
+    and across all platforms. The bucket in progress is z-scored against them
+    on every post, so a spike is flagged as soon as it crosses the threshold;
+    each alert type fires at most once per ticker and bucket, whichever
+    series crosses first. Alerts are queued and written in batches.
+    """
+    def __init__(self, bucket_seconds: int = 3600, alpha: float = 0.05,
+                 z_threshold: float = 3.0, severity_levels: dict = None,
+                 min_buckets: int = 24, min_posts: int = 5,
+                 batch_size: int = 500, flush_seconds: float = 5.0):
+        self.bucket_seconds = bucket_seconds
+        self.alpha = alpha  # EWMA weight of the newest bucket
+        self.z_threshold = z_threshold
+        # Minimum |z| per severity, highest first; the lowest level also
+        # covers alerts below its threshold
+        severity_levels = severity_levels or {'high': 6.0, 'medium': 4.5, 'low': z_threshold}
+        self.severity_levels = dict(sorted(severity_levels.items(),
+                                           key=lambda item: item[1], reverse=True))
+        self.min_buckets = min_buckets  # Warm-up before a series can alert
+        self.min_posts = min_posts  # Posts needed before judging sentiment
+
+        self.series = {}  # (ticker, platform) -> SeriesStats
+        self.ticker_alerts = {}  # ticker -> (bucket, alert types emitted in it)
+        self.pending = []  # Alert rows waiting to be written
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.last_flush = time.monotonic()
+
+    def update(self, post: dict) -> List[dict]:
+        """
+        Add one post; returns alerts it triggered (also queued for writing)
+        Input: dict with [timestamp, platform, tickers, sentiment_score]
+        """
+        timestamp = post['timestamp']
+        bucket = int(timestamp.timestamp() // self.bucket_seconds)
+        alerts = []
+        for ticker in post.get('tickers') or []:
+            for platform in (post['platform'], ALL_PLATFORMS):
+                stats = self.series.get((ticker, platform))
+                if stats is None:
+                    stats = SeriesStats(bucket)
+                    self.series[(ticker, platform)] = stats
+                elif bucket > stats.bucket:
+                    self.close_buckets(stats, bucket)
+                elif bucket < stats.bucket:
+                    continue  # Late post for a closed bucket
+
+                stats.count += 1
+                stats.sentiment_sum += post['sentiment_score']
+                alerts.extend(alert for alert in self.check(ticker, platform, stats, timestamp)
+                              if self.first_alert(ticker, bucket, alert['alert_type']))
+
+        self.pending.extend(alerts)
+        return alerts
+
+    def first_alert(self, ticker: str, bucket: int, alert_type: str) -> bool:
+        """Whether no series of this ticker raised alert_type in this bucket yet"""
+        seen_bucket, types = self.ticker_alerts.get(ticker, (None, None))
+        if seen_bucket != bucket:
+            types = set()
+            self.ticker_alerts[ticker] = (bucket, types)
+        if alert_type in types:
+            return False
+        types.add(alert_type)
+        return True
+
+    def close_buckets(self, stats: SeriesStats, bucket: int):
+        """Fold finished buckets (including empty ones) into the baselines"""
+        a = self.alpha
+        gap = min(bucket - stats.bucket, 7 * 24)
+        for i in range(gap):
+            volume = stats.count if i == 0 else 0
+            diff = volume - stats.vol_mean
+            stats.vol_mean += a * diff
+            stats.vol_var = (1 - a) * (stats.vol_var + a * diff * diff)
+            stats.buckets_seen += 1
+
+        if stats.count >= self.min_posts:
+            current = stats.sentiment_sum / stats.count
+            if stats.sent_buckets == 0:
+                stats.sent_mean = current  # Seed the baseline
+            diff = current - stats.sent_mean
+            stats.sent_mean += a * diff
+            stats.sent_var = (1 - a) * (stats.sent_var + a * diff * diff)
+            stats.sent_buckets += 1
+
+        stats.bucket = bucket
+        stats.count = 0
+        stats.sentiment_sum = 0.0
+        stats.alerted = set()
+
+    def check(self, ticker: str, platform: str, stats: SeriesStats,
+              timestamp: datetime) -> List[dict]:
+        """Z-score the bucket in progress against the baselines"""
+        if stats.buckets_seen < self.min_buckets:
+            return []
+        alerts = []
+
+        if 'volume_spike' not in stats.alerted:
+            z = (stats.count - stats.vol_mean) / math.sqrt(stats.vol_var + 1.0)
+            if z >= self.z_threshold:
+                alerts.append(self.make_alert(
+                    ticker, platform, 'volume_spike', z, stats.count,
+                    stats.vol_mean, stats.vol_var, timestamp
+                ))
+
+        if 'sentiment_shift' not in stats.alerted and stats.count >= self.min_posts \
+                and stats.sent_buckets >= self.min_buckets:
+            current = stats.sentiment_sum / stats.count
+            # A partly filled bucket's mean is noisier than a typical full one
+            var = stats.sent_var * max(1.0, stats.vol_mean / stats.count)
+            z = (current - stats.sent_mean) / math.sqrt(var + 1e-4)
+            if abs(z) >= self.z_threshold:
+                alerts.append(self.make_alert(
+                    ticker, platform, 'sentiment_shift', z, current,
+                    stats.sent_mean, stats.sent_var, timestamp
+                ))
+
+        for alert in alerts:
+            stats.alerted.add(alert['alert_type'])
+        return alerts
+
+    def make_alert(self, ticker: str, platform: str, alert_type: str, z: float,
+                   current: float, mean: float, var: float, timestamp: datetime) -> dict:
+        """Row for unusual_activity_log"""
+        severity = next((level for level, threshold in self.severity_levels.items()
+                         if abs(z) >= threshold), list(self.severity_levels)[-1])
+        return {
+            'timestamp': timestamp,
+            'ticker': ticker,
+            'alert_type': alert_type,
+            'severity': severity,
+            'details': {
+                'platform': platform,
+                'z_score': round(z, 2),
+                'current': round(current, 3),
+                'baseline_mean': round(mean, 3),
+                'baseline_std': round(math.sqrt(var), 3),
+                'bucket_start': datetime.fromtimestamp(
+                    (int(timestamp.timestamp()) // self.bucket_seconds) * self.bucket_seconds,
+                    tz=timezone.utc
+                ).isoformat()
+            }
+        }
+
+    async def maybe_flush(self, db):
+        """Write queued alerts once the batch is full or flush_seconds passed"""
+        if len(self.pending) >= self.batch_size or \
+                (self.pending and time.monotonic() - self.last_flush >= self.flush_seconds):
+            await self.flush(db)
+
+    async def flush(self, db):
+        """Write all queued alerts to unusual_activity_log in one batch"""
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, []
+        await db.executemany(
+            """
+            INSERT INTO unusual_activity_log (timestamp, ticker, alert_type, severity, details)
+            VALUES ($1, $2, $3, $4, $5)
+            """,
+            [(a['timestamp'], a['ticker'], a['alert_type'], a['severity'],
+              json.dumps(a['details'])) for a in rows]
+        )
+
+    async def process(self, posts: List[dict], db):
+        """Update with a batch of posts and write alerts when due"""
+        for post in posts:
+            self.update(post)
+        await self.maybe_flush(db)
@@ -1,16 +1,44 @@
 #!/usr/bin/env python
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, WebSocket
 from fastapi.responses import StreamingResponse
+from datetime import datetime, timezone
 import asyncio
 import json
+import os
+
+from broadcaster import SentimentBroadcaster
+from data_access import Database
+from exports import arrow_stream, decode_cursor, encode_cursor, ndjson_stream
+from response_cache import ResponseCache
 
 app = FastAPI(title="Hedge Fund Sentiment API")
 
+# Connection pool, opened at startup (see data_access.QUERIES for the SQL)
+db = Database()
+# Responses of the hot endpoints (Redis when REDIS_URL is set)
+cache = ResponseCache()
+# One DB poller shared by every sentiment-stream WebSocket
+broadcaster = SentimentBroadcaster(db)
+
+@app.on_event("startup")
+async def startup():
+    await db.connect()
+    broadcaster.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await broadcaster.stop()
+    await db.close()
+    await cache.close()
+
 class SentimentAPI:
     """
     REST API for accessing sentiment data
     """
+    db = db
+    cache = cache
+    broadcaster = broadcaster
     
     @app.get("/api/v1/fear-greed")
     async def get_fear_greed_index(self, historical: bool = False):
@@ -19,122 +47,167 @@ class SentimentAPI:
         """
         if historical:
             # Return last 30 days
-            query = """
-                SELECT timestamp, index_value, interpretation
-                FROM fear_greed_index
-                WHERE timestamp > NOW() - INTERVAL '30 days'
-                ORDER BY timestamp DESC
-            """
-            data = await self.db.fetch(query)
-            return {"data": data}
+            async def compute():
+                data = await self.db.fetch('fear_greed_history', 30)
+                return {"data": data}
+            return await self.cache.get_or_compute(
+                'fear_greed_history', {'days': 30}, compute, namespace='fear_greed')
         else:
             # Return current value
-            query = """
-                SELECT index_value, interpretation, components
-                FROM fear_greed_index
-                ORDER BY timestamp DESC
-                LIMIT 1
-            """
-            current = await self.db.fetchrow(query)
-            return {
-                "current_value": current['index_value'],
-                "interpretation": current['interpretation'],
-                "components": current['components'],
-                "as_of": datetime.now().isoformat()
-            }
+            async def compute():
+                current = await self.db.fetchrow('fear_greed_current')
+                return {
+                    "current_value": current['index_value'],
+                    "interpretation": current['interpretation'],
+                    "components": current['components'],
+                    # When the index was computed, not when the cache was filled
+                    "as_of": current['timestamp'].isoformat()
+                }
+            # Invalidated by FearGreedIndex.store_range on every write
+            return await self.cache.get_or_compute(
+                'fear_greed_current', {}, compute, namespace='fear_greed')
     
     @app.get("/api/v1/ticker/{ticker}/sentiment")
     async def get_ticker_sentiment(self, ticker: str, hours: int = 24):
         """
         Get sentiment data for specific ticker
         """
-        query = """
-            SELECT 
-                time_bucket('1 hour', timestamp) AS hour,
-                AVG(sentiment_score) AS avg_sentiment,
-                COUNT(*) AS volume,
-                MAX(sentiment_score) AS max_sentiment,
-                MIN(sentiment_score) AS min_sentiment
-            FROM sentiment_data
-            WHERE $1 = ANY(tickers)
-                AND timestamp > NOW() - INTERVAL '%s hours'
-                AND is_spam = FALSE
-            GROUP BY hour
-            ORDER BY hour DESC
-        """ % hours
-        
-        data = await self.db.fetch(query, ticker)
-        
-        if not data:
-            raise HTTPException(status_code=404, detail=f"No data for ticker {ticker}")
-        
-        return {
-            "ticker": ticker,
-            "timeframe_hours": hours,
-            "data": data
-        }
+        async def compute():
+            data = await self.db.fetch('ticker_sentiment', ticker, hours)
+            
+            if not data:
+                raise HTTPException(status_code=404, detail=f"No data for ticker {ticker}")
+            
+            return {
+                "ticker": ticker,
+                "timeframe_hours": hours,
+                "data": data
+            }
+        return await self.cache.get_or_compute(
+            'ticker_sentiment', {'ticker': ticker, 'hours': hours}, compute)
     
     @app.get("/api/v1/tickers/trending")
     async def get_trending_tickers(self, limit: int = 20):
         """
         Get most mentioned tickers in last 24 hours
         """
-        query = """
-            SELECT 
-                unnest(tickers) AS ticker,
-                COUNT(*) AS mentions,
-                AVG(sentiment_score) AS avg_sentiment
-            FROM sentiment_data
-            WHERE timestamp > NOW() - INTERVAL '24 hours'
-                AND is_spam = FALSE
-            GROUP BY ticker
-            ORDER BY mentions DESC
-            LIMIT $1
-        """
-        
-        data = await self.db.fetch(query, limit)
-        return {"trending_tickers": data}
+        async def compute():
+            data = await self.db.fetch('trending_tickers', 24, limit)
+            return {"trending_tickers": data}
+        return await self.cache.get_or_compute('trending_tickers', {'limit': limit}, compute)
     
     @app.get("/api/v1/unusual-activity")
     async def get_unusual_activity(self, hours: int = 24):
         """
         Get tickers with unusual activity
         """
-        query = """
-            SELECT ticker, alert_type, severity, details, timestamp
-            FROM unusual_activity_log
-            WHERE timestamp > NOW() - INTERVAL '%s hours'
-                AND severity IN ('medium', 'high')
-            ORDER BY timestamp DESC
-        """ % hours
+        async def compute():
+            alerts = await self.db.fetch('unusual_activity', hours)
+            return {"unusual_activity": alerts}
+        return await self.cache.get_or_compute('unusual_activity', {'hours': hours}, compute)
+    
+    @app.get("/api/v1/ticker/{ticker}/posts")
+    async def get_ticker_posts(self, ticker: str, hours: int = 24, limit: int = 500,
+                               cursor: str = None):
+        """
+        Raw posts for a ticker, newest first, keyset-paginated on (timestamp, id)
+        Pass next_cursor back as cursor to get the following page
+        """
+        limit = min(max(limit, 1), 5000)
+        if cursor:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            after = (datetime.max.replace(tzinfo=timezone.utc), 2 ** 63 - 1)
+        
+        data = await self.db.fetch('ticker_posts_page', ticker, hours, *after, limit)
+        next_cursor = None
+        if len(data) == limit:
+            next_cursor = encode_cursor(data[-1]['timestamp'], data[-1]['id'])
         
-        alerts = await self.db.fetch(query)
-        return {"unusual_activity": alerts}
+        return {
+            "ticker": ticker,
+            "timeframe_hours": hours,
+            "data": data,
+            "next_cursor": next_cursor
+        }
+    
+    @app.get("/api/v1/export/sentiment")
+    async def export_sentiment(self, start: datetime, end: datetime, ticker: str = None,
+                               format: str = 'ndjson'):
+        """
+        Stream raw sentiment rows in [start, end) as NDJSON or Arrow IPC
+        Rows come from a server-side cursor batch by batch, so memory stays
+        flat however long the range is (naive times are taken as UTC)
+        """
+        if end <= start:
+            raise HTTPException(status_code=400, detail="end must be after start")
+        if format not in ('ndjson', 'arrow'):
+            raise HTTPException(status_code=400, detail="format must be ndjson or arrow")
+        
+        batches = self.db.stream('export_sentiment', start, end, ticker)
+        filename = f"sentiment_{start:%Y%m%d%H%M}_{end:%Y%m%d%H%M}"
+        if format == 'arrow':
+            return StreamingResponse(
+                arrow_stream(batches),
+                media_type='application/vnd.apache.arrow.stream',
+                headers={'Content-Disposition': f'attachment; filename="{filename}.arrows"'}
+            )
+        return StreamingResponse(
+            ndjson_stream(batches),
+            media_type='application/x-ndjson',
+            headers={'Content-Disposition': f'attachment; filename="{filename}.ndjson"'}
+        )
+    
+    @app.get("/api/v1/metrics/db-pool")
+    async def get_db_pool_metrics(self):
+        """
+        Connection pool size, idle connections, waiters and acquire wait
+        """
+        return {**self.db.metrics(), 'response_cache': self.cache.stats(),
+                'stream': self.broadcaster.stats()}
     
     @app.websocket("/ws/sentiment-stream")
-    async def sentiment_stream(self, websocket):
+    async def sentiment_stream(self, websocket: WebSocket):
         """
         WebSocket endpoint for real-time sentiment stream
+        Optional filters: ?tickers=AAPL,TSLA&platforms=reddit,discord
         """
         await websocket.accept()
+        params = websocket.query_params
+        subscription = self.broadcaster.subscribe(
+            tickers=[t for t in params.get('tickers', '').split(',') if t] or None,
+            platforms=[p for p in params.get('platforms', '').split(',') if p] or None
+        )
         
+        # Wait on the client and the queue together, so a disconnect is seen
+        # even when no rows match this client's filters
+        receive = asyncio.ensure_future(websocket.receive())
+        get = asyncio.ensure_future(subscription.get())
         try:
             while True:
-                # Stream new sentiment data as it arrives
-                new_data = await self.get_latest_sentiment()
-                await websocket.send_json(new_data)
-                await asyncio.sleep(1)  # 1 second updates
-        except:
+                done, _ = await asyncio.wait({receive, get},
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if receive in done:
+                    if receive.result()['type'] == 'websocket.disconnect':
+                        break
+                    receive = asyncio.ensure_future(websocket.receive())  # Ignore client messages
+                if get in done:
+                    # New rows from the shared producer (no per-client queries)
+                    await websocket.send_json(get.result())
+                    get = asyncio.ensure_future(subscription.get())
+        except Exception:
             await websocket.close()
+        finally:
+            receive.cancel()
+            get.cancel()
+            self.broadcaster.unsubscribe(subscription)
     
     async def get_latest_sentiment(self):
         """Fetch latest sentiment data"""
-        query = """
-            SELECT * FROM sentiment_data
-            WHERE timestamp > NOW() - INTERVAL '10 seconds'
-            ORDER BY timestamp DESC
-        """
-        return await self.db.fetch(query)
+        return await self.db.fetch('latest_sentiment', 10)
 
 # Authentication middleware (simplified)
 def verify_api_key(api_key: str):
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+MARKET = 'MARKET'  # Column used for market-wide series (Fear & Greed)
+
+# Worker globals, set once per process by init_worker
+SIGNAL = None
+PRICES = None
+
+def read_table(path: str) -> pd.DataFrame:
+    """Local Parquet or CSV file"""
+    if path.endswith('.parquet') or os.path.isdir(path):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+def load_prices(path: str, freq: str = '1h') -> pd.DataFrame:
+    """
+    Price bars -> T x N close matrix on time buckets (last close per bucket)
+    Input file: [timestamp, ticker, close]
+    """
+    bars = read_table(path)
+    bars['bucket'] = pd.to_datetime(bars['timestamp']).dt.floor(freq)
+    return bars.pivot_table(index='bucket', columns='ticker', values='close',
+                            aggfunc='last').sort_index()
+
+def load_sentiment(path: str, freq: str = '1h') -> pd.DataFrame:
+    """
+    Sentiment history -> T x N matrix on time buckets
+    Input file, one of:
+      - sentiment_data rows [timestamp, tickers|ticker, sentiment_score]
+      - ticker_sentiment_hourly rows [bucket, ticker, avg_sentiment, mention_count]
+      - fear_greed_history rows [timestamp, index_value] (one MARKET column,
+        rescaled to -1..1)
+    """
+    data = read_table(path)
+    if 'bucket' in data.columns and 'timestamp' not in data.columns:
+        data = data.rename(columns={'bucket': 'timestamp'})
+    data['bucket'] = pd.to_datetime(data['timestamp']).dt.floor(freq)
+
+    if 'index_value' in data.columns:
+        data['ticker'] = MARKET
+        data['value'] = (data['index_value'] - 50) / 50
+        weights = None
+    elif 'avg_sentiment' in data.columns:
+        data['value'] = data['avg_sentiment']
+        weights = 'mention_count' if 'mention_count' in data.columns else None
+    else:
+        if 'ticker' not in data.columns:
+            data = data.explode('tickers', ignore_index=True).rename(columns={'tickers': 'ticker'})
+        data['value'] = data['sentiment_score']
+        weights = None
+
+    data = data.dropna(subset=['ticker', 'value'])
+    if weights:
+        data['weighted'] = data['value'] * data[weights]
+        grouped = data.groupby(['bucket', 'ticker'])[['weighted', weights]].sum()
+        values = grouped['weighted'] / grouped[weights]
+    else:
+        values = data.groupby(['bucket', 'ticker'])['value'].mean()
+    return values.unstack('ticker').sort_index()
+
+def align(sentiment: pd.DataFrame, prices: pd.DataFrame,
+          market_ticker: Optional[str] = None) -> tuple:
+    """
+    Common bucket index and ticker columns
+    Prices are forward-filled; sentiment is left NaN where nothing was said.
+    A MARKET sentiment column is evaluated against market_ticker's prices.
+    """
+    if MARKET in sentiment.columns and market_ticker:
+        sentiment = sentiment.rename(columns={MARKET: market_ticker})
+    tickers = sentiment.columns.intersection(prices.columns)
+    index = sentiment.index.union(prices.index)
+    prices = prices.reindex(index=index, columns=tickers).ffill()
+    sentiment = sentiment.reindex(index=index, columns=tickers)
+    return sentiment, prices
+
+def ewma(values: np.ndarray, span: int) -> np.ndarray:
+    """EWMA down the time axis, carrying the last level through NaN buckets"""
+    alpha = 2.0 / (span + 1)
+    out = np.empty_like(values)
+    level = np.full(values.shape[1], np.nan)
+    for t in range(values.shape[0]):
+        row = values[t]
+        seen = ~np.isnan(row)
+        fresh = seen & np.isnan(level)
+        level = np.where(fresh, row, level)
+        level = np.where(seen & ~fresh, level + alpha * (row - level), level)
+        out[t] = level
+    return out
+
+def forward_returns(prices: np.ndarray, horizon: int) -> np.ndarray:
+    """Return from bucket t to t + horizon (NaN for the last buckets)"""
+    out = np.full_like(prices, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out[:-horizon] = prices[horizon:] / prices[:-horizon] - 1
+    return out
+
+def rank_rows(values: np.ndarray) -> np.ndarray:
+    """Ranks along axis 1; ties get their average rank (NaN stays NaN)"""
+    order = np.argsort(values, axis=1, kind='stable')  # NaN sorts last
+    ordered = np.take_along_axis(values, order, axis=1)
+    positions = np.arange(values.shape[1])
+
+    # Runs of equal values in each sorted row share the mean of their positions
+    starts = np.ones(values.shape, dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    ends = np.ones(values.shape, dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+    run_start = np.maximum.accumulate(np.where(starts, positions, 0), axis=1)
+    run_end = np.minimum.accumulate(
+        np.where(ends, positions, values.shape[1] - 1)[:, ::-1], axis=1)[:, ::-1]
+
+    ranks = np.empty_like(values)
+    np.put_along_axis(ranks, order, (run_start + run_end) / 2, axis=1)
+    ranks[np.isnan(values)] = np.nan
+    return ranks
+
+def rank_ic(signal: np.ndarray, returns: np.ndarray) -> np.ndarray:
+    """
+    Spearman IC per bucket across tickers (T values), or one time-series IC
+    when there is a single column; NaN where either side is constant
+    """
+    if signal.shape[1] == 1:
+        signal, returns = signal.T, returns.T
+    valid = ~np.isnan(signal) & ~np.isnan(returns)
+    x = rank_rows(np.where(valid, signal, np.nan))
+    y = rank_rows(np.where(valid, returns, np.nan))
+
+    n = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x = x - (np.nansum(x, axis=1) / n)[:, None]
+        y = y - (np.nansum(y, axis=1) / n)[:, None]
+        x_var = np.nansum(x * x, axis=1)
+        y_var = np.nansum(y * y, axis=1)
+        ic = np.nansum(x * y, axis=1) / np.sqrt(x_var * y_var)
+    ic[(n < 3) | (x_var == 0) | (y_var == 0)] = np.nan
+    return ic
+
+def evaluate(span: int, horizons: list, thresholds: list) -> list:
+    """All (horizon, threshold) cells for one smoothing span"""
+    signal = ewma(SIGNAL, span) if span > 1 else SIGNAL
+    rows = []
+    for horizon in horizons:
+        returns = forward_returns(PRICES, horizon)
+        ic = rank_ic(signal, returns)
+        ic = ic[~np.isnan(ic)]
+        ic_mean = float(ic.mean()) if len(ic) else np.nan
+        ic_std = float(ic.std()) if len(ic) > 1 else np.nan
+
+        valid = ~np.isnan(signal) & ~np.isnan(returns)
+        for threshold in thresholds:
+            active = valid & (np.abs(signal) > threshold)
+            n_signals = int(active.sum())
+            direction = np.sign(signal[active])
+            realized = returns[active]
+            rows.append({
+                'span': span,
+                'horizon': horizon,
+                'threshold': threshold,
+                'ic_mean': ic_mean,
+                'ic_std': ic_std,
+                'ic_ir': ic_mean / ic_std if ic_std else np.nan,
+                'ic_buckets': len(ic),
+                'n_signals': n_signals,
+                'hit_rate': float((direction == np.sign(realized)).mean()) if n_signals else np.nan,
+                'avg_return': float((direction * realized).mean()) if n_signals else np.nan,
+            })
+    return rows
+
+def init_worker(signal: np.ndarray, prices: np.ndarray):
+    """Share the aligned matrices with a pool worker once"""
+    global SIGNAL, PRICES
+    SIGNAL, PRICES = signal, prices
+
+def run_grid(sentiment: pd.DataFrame, prices: pd.DataFrame, spans: list,
+             horizons: list, thresholds: list, workers: int = None) -> pd.DataFrame:
+    """
+    Evaluate the full parameter grid
+    Grid cells are fanned out per span (each span's smoothed signal is reused
+    for all of its horizons and thresholds).
+    Returns: DataFrame, one row per (span, horizon, threshold)
+    """
+    signal = sentiment.to_numpy(np.float64)
+    closes = prices.to_numpy(np.float64)
+    workers = workers or os.cpu_count()
+
+    if workers <= 1 or len(spans) == 1:
+        init_worker(signal, closes)
+        rows = [evaluate(span, horizons, thresholds) for span in spans]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(spans)),
+                                 initializer=init_worker,
+                                 initargs=(signal, closes)) as pool:
+            rows = list(pool.map(evaluate, spans,
+                                 itertools.repeat(horizons), itertools.repeat(thresholds)))
+    results = pd.DataFrame(list(itertools.chain.from_iterable(rows)))
+    return results.sort_values(['span', 'horizon', 'threshold'], ignore_index=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest sentiment signals against prices')
+    parser.add_argument('--prices', required=True, help='Parquet/CSV bars [timestamp, ticker, close]')
+    parser.add_argument('--sentiment', required=True, help='Parquet/CSV sentiment history')
+    parser.add_argument('--freq', default='1h', help='Time bucket (pandas offset)')
+    parser.add_argument('--spans', type=int, nargs='+', default=[1, 3, 6, 12, 24])
+    parser.add_argument('--horizons', type=int, nargs='+', default=[1, 4, 24])
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.0, 0.1, 0.2, 0.3])
+    parser.add_argument('--market-ticker', default='SPY',
+                        help='Price series for a market-wide (Fear & Greed) signal')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', help='Write results to CSV')
+    args = parser.parse_args()
+
+    sentiment = load_sentiment(args.sentiment, args.freq)
+    prices = load_prices(args.prices, args.freq)
+    sentiment, prices = align(sentiment, prices, args.market_ticker)
+    print(f"{sentiment.shape[0]} buckets x {sentiment.shape[1]} tickers")
+
+    results = run_grid(sentiment, prices, args.spans, args.horizons,
+                       args.thresholds, args.workers)
+    if args.out:
+        results.to_csv(args.out, index=False)
+    print(results.sort_values('ic_mean', ascending=False).head(20).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+#!/usr/bin/env python
+"""
+Synthetic-corpus benchmarks for the processing pipeline
+Run with: python -m benchmarks.run --sizes 10000 100000 1000000
+"""
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+PLATFORMS = ['reddit', 'discord', 'telegram', 'stocktwits']
+
+# Ticker -> company name used in prose
+COMPANIES = {
+    'AAPL': 'apple', 'MSFT': 'microsoft', 'TSLA': 'tesla', 'GME': 'gamestop',
+    'AMC': None, 'GOOGL': None,
+}
+
+ORGANIC_TEMPLATES = [
+    "${t} looking strong into earnings, loading calls",
+    "Just bought more {t} shares, price target 300 by summer",
+    "{company} is going to moon after this quarter, bullish",
+    "Sold my ${t} puts, this rally is not stopping",
+    "DD on {t}: margins improving, buy the dip before the breakout",
+    "Anyone else worried about {company}? Feels like a crash is coming, fear everywhere",
+    "${t} and ${t2} both tanking today, panic selling all over",
+    "Long {t} stock, short ${t2}. Thoughts on the spread?",
+    "The CEO of {company} said nothing new on the call, holding",
+    "Market feels weird today. Not touching anything until CPI.",
+]
+
+# Filler vocabulary so organic posts differ like real prose does
+FILLER = (
+    "honestly think the market is overreacting again after that report "
+    "my position is small but conviction is high for the next few weeks "
+    "volume has been picking up and the chart looks cleaner than last month "
+    "management keeps guiding conservative which usually means a beat "
+    "not financial advice obviously but the setup is too good to ignore "
+    "waiting for the fed minutes before adding anything to this trade "
+    "retail is piling in which makes me a bit nervous to be honest "
+    "the options chain is wild this week with huge open interest "
+    "bagholders from last year finally getting some relief here "
+    "earnings whisper numbers look way above consensus estimates"
+).split()
+
+SPAM_TEMPLATES = [
+    "🚀🚀🚀🚀 ${t} TO THE MOON 🚀🚀🚀🚀",
+    "Click here for free stock picks!!!!!! ${t}",
+    "DM me for my private signals group, 500% gains on ${t}",
+    "Join my discord for guaranteed winners. Limited time!",
+    "buy now",
+]
+
+class CorpusGenerator:
+    """
+    Seeded generator of realistic social posts for benchmarking
+    Mixes organic posts (cashtags, bare tickers in context, company names),
+    spam templates, cross-posts of earlier content to other platforms (with
+    small edits) and bot bursts (one author posting many times in minutes).
+    Rows are in timestamp order and end at `end` (default now), so the
+    time-windowed index and aggregator see live-looking data.
+    """
+    def __init__(self, seed: int = 42, spam_rate: float = 0.05,
+                 cross_post_rate: float = 0.05, burst_rate: float = 0.0005,
+                 n_authors: int = 50_000, posts_per_second: float = 5.0,
+                 end: Optional[datetime] = None):
+        self.seed = seed
+        self.spam_rate = spam_rate
+        self.cross_post_rate = cross_post_rate
+        self.burst_rate = burst_rate  # Chance a post starts a bot burst
+        self.n_authors = n_authors
+        self.posts_per_second = posts_per_second
+        self.end = end or datetime.now()
+
+    def generate(self, n: int) -> pd.DataFrame:
+        """
+        n posts: [id, timestamp, platform, author, content, sentiment_score,
+        kind] where kind is organic/spam/cross_post/burst (ground truth)
+        """
+        rng = np.random.default_rng(self.seed)
+        tickers = list(COMPANIES)
+        # Zipf-like ticker popularity
+        popularity = 1.0 / np.arange(1, len(tickers) + 1)
+        popularity /= popularity.sum()
+
+        content, kind, author, platform = [], [], [], []
+        burst_left, burst_author, burst_text = 0, None, None
+        for i in range(n):
+            if burst_left:
+                burst_left -= 1
+                content.append(burst_text + f" #{burst_left}")
+                kind.append('burst')
+                author.append(burst_author)
+                platform.append('stocktwits')
+                continue
+
+            roll = rng.random()
+            t, t2 = rng.choice(tickers, size=2, replace=False, p=popularity)
+            if roll < self.burst_rate:
+                burst_left = int(rng.integers(60, 200))
+                burst_author = f'bot_{i}'
+                burst_text = rng.choice(SPAM_TEMPLATES).format(t=t)
+                text, label, who = burst_text, 'burst', burst_author
+            elif roll < self.burst_rate + self.spam_rate:
+                text = rng.choice(SPAM_TEMPLATES).format(t=t)
+                label, who = 'spam', f'user_{rng.integers(self.n_authors)}'
+            elif roll < self.burst_rate + self.spam_rate + self.cross_post_rate and content:
+                # Re-post an earlier organic post, lightly edited
+                source = content[int(rng.integers(max(0, len(content) - 5000), len(content)))]
+                text = source + rng.choice(['', ' (x-post)', '!', ' thoughts?'])
+                label, who = 'cross_post', f'user_{rng.integers(self.n_authors)}'
+            else:
+                template = rng.choice(ORGANIC_TEMPLATES)
+                company = COMPANIES[t] or t
+                text = template.format(t=t, t2=t2, company=company)
+                # Free-form tail so organic posts are not near-duplicates
+                text += ' ' + ' '.join(rng.choice(FILLER, size=int(rng.integers(8, 30))))
+                label, who = 'organic', f'user_{rng.integers(self.n_authors)}'
+
+            content.append(text)
+            kind.append(label)
+            author.append(who)
+            platform.append(PLATFORMS[int(rng.integers(len(PLATFORMS)))])
+
+        gaps = rng.exponential(1.0 / self.posts_per_second, size=n)
+        gaps[np.array(kind) == 'burst'] = rng.uniform(0.5, 3.0, size=kind.count('burst'))
+        offsets = np.cumsum(gaps)
+        start = self.end - timedelta(seconds=float(offsets[-1])) if n else self.end
+        timestamps = pd.to_datetime(start) + pd.to_timedelta(offsets, unit='s')
+
+        return pd.DataFrame({
+            'id': np.arange(n),
+            'timestamp': timestamps,
+            'platform': platform,
+            'author': author,
+            'content': content,
+            # Stand-in scores for downstream stages when FinBERT is skipped
+            'sentiment_score': rng.uniform(-1, 1, size=n).round(3),
+            'kind': kind,
+        })
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.corpus import CorpusGenerator
+from benchmarks.stages import STAGES
+
+def run(sizes: list, stages: list, seed: int = 42, latency_sample: int = 10_000,
+        sentiment_limit: int = 2000, end_to_end_sentiment: bool = False) -> dict:
+    """Run every stage at every corpus size; returns the results document"""
+    records = []
+    for size in sizes:
+        start = time.perf_counter()
+        posts = CorpusGenerator(seed=seed).generate(size)
+        print(f"corpus {size}: generated in {time.perf_counter() - start:.1f}s",
+              file=sys.stderr)
+
+        for stage in stages:
+            bench = STAGES[stage]
+            if stage == 'sentiment':
+                record = bench(posts, latency_sample, limit=sentiment_limit)
+            elif stage == 'end_to_end':
+                record = bench(posts, latency_sample, with_sentiment=end_to_end_sentiment)
+            else:
+                record = bench(posts, latency_sample)
+            record['size'] = size
+            records.append(record)
+            print(f"  {stage:<11} {record.get('throughput') or '-':>12} posts/s "
+                  f"p99 {record.get('p99_ms', '-')} ms", file=sys.stderr)
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(),
+            'seed': seed,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+        },
+        'results': records,
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2) -> list:
+    """
+    Regressions against a stored baseline, keyed by (stage, size)
+    Throughput below (1 - tolerance) x baseline, or p99 above
+    (1 + tolerance) x baseline, counts as a regression.
+    """
+    previous = {(r['stage'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for record in results['results']:
+        base = previous.get((record['stage'], record['size']))
+        if base is None:
+            continue
+        if record.get('throughput') and base.get('throughput') and \
+                record['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append({'stage': record['stage'], 'size': record['size'],
+                                'metric': 'throughput', 'baseline': base['throughput'],
+                                'current': record['throughput']})
+        if record.get('p99_ms') and base.get('p99_ms') and \
+                record['p99_ms'] > base['p99_ms'] * (1 + tolerance):
+            regressions.append({'stage': record['stage'], 'size': record['size'],
+                                'metric': 'p99_ms', 'baseline': base['p99_ms'],
+                                'current': record['p99_ms']})
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Pipeline benchmarks on a synthetic corpus')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=list(STAGES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency-sample', type=int, default=10_000,
+                        help='Posts timed one by one for latency percentiles')
+    parser.add_argument('--sentiment-limit', type=int, default=2000,
+                        help='Max posts through FinBERT per size')
+    parser.add_argument('--end-to-end-sentiment', action='store_true',
+                        help='Run FinBERT inside the end-to-end stage')
+    parser.add_argument('--out', default='benchmark_results.json')
+    parser.add_argument('--baseline', help='Results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.stages, args.seed, args.latency_sample,
+                  args.sentiment_limit, args.end_to_end_sentiment)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        results['regressions'] = compare(results, baseline, args.tolerance)
+
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"wrote {args.out}", file=sys.stderr)
+
+    for regression in results.get('regressions', []):
+        print(f"REGRESSION {regression['stage']}@{regression['size']} "
+              f"{regression['metric']}: {regression['baseline']} -> {regression['current']}",
+              file=sys.stderr)
+    if results.get('regressions'):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+from deduplication import ContentDeduplicator
+from entity_extraction import TickerExtractor
+from indices import FearGreedIndex
+from lexicon import LexiconScanner
+from spam_detection import SpamBotFilter
+from ticker_sentiment import TickerSentimentAggregator
+
+def latency_summary(seconds: List[float]) -> dict:
+    """Per-call latency percentiles in milliseconds"""
+    if not seconds:
+        return {}
+    ms = np.asarray(seconds) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(ms, 50)), 4),
+        'p95_ms': round(float(np.percentile(ms, 95)), 4),
+        'p99_ms': round(float(np.percentile(ms, 99)), 4),
+        'max_ms': round(float(ms.max()), 4),
+    }
+
+def timed_calls(fn: Callable, items) -> tuple:
+    """Call fn on every item; returns (results, per-call seconds)"""
+    results, seconds = [], []
+    clock = time.perf_counter
+    for item in items:
+        start = clock()
+        results.append(fn(item))
+        seconds.append(clock() - start)
+    return results, seconds
+
+def result(stage: str, posts: int, seconds: float, latencies: List[float] = None,
+           **extra) -> dict:
+    """One machine-readable benchmark record"""
+    record = {
+        'stage': stage,
+        'posts': posts,
+        'seconds': round(seconds, 4),
+        'throughput': round(posts / seconds, 1) if seconds > 0 else None,
+    }
+    record.update(latency_summary(latencies or []))
+    record.update(extra)
+    return record
+
+def bench_extract(posts: pd.DataFrame, latency_sample: int) -> dict:
+    """TickerExtractor: batch throughput, per-post latency on a sample"""
+    extractor = TickerExtractor()
+    start = time.perf_counter()
+    mentions = extractor.extract_tickers_batch(posts['content'])
+    seconds = time.perf_counter() - start
+    _, latencies = timed_calls(extractor.extract_tickers,
+                               posts['content'].iloc[:latency_sample])
+    return result('extract', len(posts), seconds, latencies, mentions=len(mentions))
+
+def bench_spam(posts: pd.DataFrame, latency_sample: int) -> dict:
+    """SpamBotFilter: vectorized batch throughput, per-post latency on a sample"""
+    start = time.perf_counter()
+    flags = SpamBotFilter().is_spam_batch(posts)
+    seconds = time.perf_counter() - start
+
+    spam_filter = SpamBotFilter()
+    sample = posts.iloc[:latency_sample]
+    _, latencies = timed_calls(
+        lambda row: spam_filter.is_spam(row[0], {'author': row[1], 'platform': row[2],
+                                                 'timestamp': row[3]}),
+        zip(sample['content'], sample['author'], sample['platform'],
+            sample['timestamp'].dt.to_pydatetime())
+    )
+    return result('spam', len(posts), seconds, latencies,
+                  flagged=int(flags['is_spam'].sum()))
+
+def bench_dedup(posts: pd.DataFrame, latency_sample: int) -> dict:
+    """ContentDeduplicator: streaming, every post timed"""
+    dedup = ContentDeduplicator()
+    timestamps = posts['timestamp'].dt.to_pydatetime()
+    start = time.perf_counter()
+    flags, latencies = timed_calls(
+        lambda row: dedup.is_duplicate(row[0], {'timestamp': row[1]}),
+        zip(posts['content'], timestamps)
+    )
+    seconds = time.perf_counter() - start
+    return result('dedup', len(posts), seconds, latencies, duplicates=int(sum(flags)))
+
+def bench_lexicon(posts: pd.DataFrame, latency_sample: int) -> dict:
+    """LexiconScanner: ingest-time keyword hit columns"""
+    scanner = LexiconScanner()
+    start = time.perf_counter()
+    scanner.scan_frame(posts)
+    seconds = time.perf_counter() - start
+    _, latencies = timed_calls(scanner.scan, posts['content'].iloc[:latency_sample])
+    return result('lexicon', len(posts), seconds, latencies)
+
+def bench_sentiment(posts: pd.DataFrame, latency_sample: int, limit: int = 2000) -> dict:
+    """FinancialSentimentAnalyzer on at most `limit` posts (skipped without torch)"""
+    try:
+        from sentiment_analysis import FinancialSentimentAnalyzer
+        analyzer = FinancialSentimentAnalyzer()
+        analyzer.preload()
+    except Exception as e:  # torch/transformers missing or model unavailable
+        return {'stage': 'sentiment', 'posts': 0, 'skipped': str(e)}
+
+    texts = posts['content'].iloc[:limit].tolist()
+    start = time.perf_counter()
+    analyzer.batch_analyze(texts)
+    seconds = time.perf_counter() - start
+    _, latencies = timed_calls(analyzer.analyze_sentiment,
+                               texts[:min(latency_sample, 200)])
+    return result('sentiment', len(texts), seconds, latencies)
+
+def enrich(posts: pd.DataFrame) -> pd.DataFrame:
+    """Add the tickers and hit columns the downstream stages read"""
+    extractor = TickerExtractor()
+    mentions = extractor.extract_tickers_batch(posts['content'])
+    enriched = posts.assign(tickers=extractor.to_ticker_lists(mentions, len(posts)))
+    return pd.concat([enriched, LexiconScanner().scan_frame(posts)], axis=1)
+
+def bench_fear_greed(posts: pd.DataFrame, latency_sample: int, repeats: int = 5) -> dict:
+    """FearGreedIndex.calculate over the processed frame"""
+    data = enrich(posts)
+    index = FearGreedIndex()
+    _, latencies = timed_calls(lambda _: index.calculate(data), range(repeats))
+    return result('fear_greed', len(posts) * repeats, sum(latencies), latencies)
+
+def bench_aggregate(posts: pd.DataFrame, latency_sample: int, repeats: int = 3) -> dict:
+    """TickerSentimentAggregator.aggregate_all over the processed frame"""
+    data = enrich(posts)
+    aggregator = TickerSentimentAggregator()
+    outputs, latencies = timed_calls(lambda _: aggregator.aggregate_all(data), range(repeats))
+    return result('aggregate', len(posts) * repeats, sum(latencies), latencies,
+                  tickers=len(outputs[-1]))
+
+def bench_end_to_end(posts: pd.DataFrame, latency_sample: int,
+                     with_sentiment: bool = False) -> dict:
+    """
+    Extract -> spam -> dedup -> (sentiment) -> lexicon -> aggregate + index
+    Uses the corpus' stand-in scores unless with_sentiment is set.
+    """
+    start = time.perf_counter()
+    extractor = TickerExtractor()
+    mentions = extractor.extract_tickers_batch(posts['content'])
+    data = posts.assign(tickers=extractor.to_ticker_lists(mentions, len(posts)))
+
+    data = data[~SpamBotFilter().is_spam_batch(data)['is_spam']]
+
+    dedup = ContentDeduplicator()
+    duplicate = [dedup.is_duplicate(c, {'timestamp': t}) for c, t in
+                 zip(data['content'], data['timestamp'].dt.to_pydatetime())]
+    data = data[~np.array(duplicate, dtype=bool)]
+
+    if with_sentiment:
+        from sentiment_analysis import FinancialSentimentAnalyzer
+        results = FinancialSentimentAnalyzer().batch_analyze(data['content'].tolist())
+        data = data.assign(sentiment_score=[r['score'] for r in results])
+
+    data = pd.concat([data, LexiconScanner().scan_frame(data)], axis=1)
+    TickerSentimentAggregator().aggregate_all(data)
+    FearGreedIndex().calculate(data)
+    seconds = time.perf_counter() - start
+    return result('end_to_end', len(posts), seconds, kept=len(data),
+                  with_sentiment=with_sentiment)
+
+STAGES = {
+    'extract': bench_extract,
+    'spam': bench_spam,
+    'dedup': bench_dedup,
+    'lexicon': bench_lexicon,
+    'sentiment': bench_sentiment,
+    'fear_greed': bench_fear_greed,
+    'aggregate': bench_aggregate,
+    'end_to_end': bench_end_to_end,
+}
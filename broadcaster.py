@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+import asyncio
+import logging
+import time
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """
+    One WebSocket client: optional ticker/platform filters and a bounded queue
+    When the client falls behind, the oldest pending message is dropped.
+    """
+    def __init__(self, tickers: Optional[Iterable[str]] = None,
+                 platforms: Optional[Iterable[str]] = None, queue_size: int = 100):
+        self.tickers = {t.upper() for t in tickers} if tickers else None
+        self.platforms = set(platforms) if platforms else None
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def matches(self, row: dict) -> bool:
+        if self.platforms is not None and row['platform'] not in self.platforms:
+            return False
+        if self.tickers is not None and not self.tickers.intersection(row['tickers'] or []):
+            return False
+        return True
+
+    def offer(self, rows: List[dict]):
+        """Queue the rows this client wants from one poll (never blocks)"""
+        rows = [row for row in rows if self.matches(row)]
+        if not rows:
+            return
+        if self.queue.full():
+            self.queue.get_nowait()  # Drop the oldest batch
+            self.dropped += 1
+        self.queue.put_nowait(rows)
+
+    async def get(self) -> List[dict]:
+        return await self.queue.get()
+
+class SentimentBroadcaster:
+    """
+    Single producer for the sentiment WebSocket
+    Tails sentiment_data by its BIGSERIAL id (insert order, unlike the
+    event timestamp), one query per poll no matter how many clients are
+    connected, and fans each batch out to every subscription. Ids skipped
+    below the watermark may belong to transactions that commit late; they
+    are re-fetched each poll until they appear or gap_timeout passes
+    (rolled-back inserts leave permanent gaps). Each row is delivered once.
+    """
+    def __init__(self, db, poll_interval: float = 1.0, batch_limit: int = 1000,
+                 queue_size: int = 100, gap_timeout: float = 30.0,
+                 max_gap: int = 10_000):
+        self.db = db
+        self.poll_interval = poll_interval
+        self.batch_limit = batch_limit
+        self.queue_size = queue_size
+        self.gap_timeout = gap_timeout  # Seconds to wait for a skipped id
+        self.max_gap = max_gap  # Larger id jumps are not tracked (sequence skips)
+
+        self.subscriptions = set()
+        self.watermark = None  # Highest id read
+        self.gaps = {}  # Skipped id -> monotonic time first missed
+        self.task = None
+
+    def subscribe(self, tickers: Optional[Iterable[str]] = None,
+                  platforms: Optional[Iterable[str]] = None) -> Subscription:
+        subscription = Subscription(tickers, platforms, self.queue_size)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.discard(subscription)
+
+    def start(self):
+        """Start the producer task (call from app startup)"""
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self):
+        """Poll loop; a failed poll is logged and retried on the next tick"""
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("sentiment broadcast poll failed")
+            await asyncio.sleep(self.poll_interval)
+
+    async def poll(self):
+        """Fetch late-committed and new rows and fan them out"""
+        if self.watermark is None:
+            # Start at the current tail; clients only see new rows
+            latest = await self.db.fetchrow('stream_watermark')
+            self.watermark = latest['id'] or 0
+            return
+
+        if self.gaps:
+            records = await self.db.fetch('stream_ids', list(self.gaps))
+            for record in records:
+                del self.gaps[record['id']]
+            expired = time.monotonic() - self.gap_timeout
+            self.gaps = {i: t for i, t in self.gaps.items() if t > expired}
+            self.publish(records)
+
+        while True:
+            records = await self.db.fetch('stream_after', self.watermark, self.batch_limit)
+            if not records:
+                return
+            self.track_gaps(records)
+            self.watermark = records[-1]['id']
+            self.publish(records)
+            if len(records) < self.batch_limit:
+                return
+
+    def track_gaps(self, records):
+        """Remember ids skipped between the watermark and this batch"""
+        now = time.monotonic()
+        expected = self.watermark + 1
+        for record in records:
+            if record['id'] - expected <= self.max_gap:
+                for missing in range(expected, record['id']):
+                    self.gaps[missing] = now
+            expected = record['id'] + 1
+
+    def publish(self, records):
+        """Fan non-spam rows out to every subscription"""
+        rows = [self.to_message(record) for record in records if not record['is_spam']]
+        if not rows:
+            return
+        for subscription in list(self.subscriptions):
+            subscription.offer(rows)
+
+    @staticmethod
+    def to_message(record) -> dict:
+        """JSON-ready row for send_json"""
+        row = dict(record.items())
+        del row['is_spam']
+        row['timestamp'] = row['timestamp'].isoformat()
+        row['tickers'] = list(row['tickers'] or [])
+        return row
+
+    def stats(self) -> dict:
+        return {
+            'subscribers': len(self.subscriptions),
+            'dropped': sum(s.dropped for s in self.subscriptions),
+            'watermark': self.watermark,
+            'pending_gaps': len(self.gaps),
+        }
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from hot_store import HIT_COLUMNS, SentimentRingStore
+from lexicon import LexiconScanner
+
+# sentiment_data columns kept in cold storage (platform is a partition key)
+SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('timestamp', pa.timestamp('us', tz='UTC')),
+    ('source_type', pa.string()),
+    ('content', pa.string()),
+    ('author', pa.string()),
+    ('tickers', pa.list_(pa.string())),
+    ('sentiment_score', pa.float64()),
+    ('sentiment_label', pa.string()),
+    ('confidence', pa.float64()),
+    ('volume_metric', pa.int32()),
+    ('is_spam', pa.bool_()),
+] + [(name, pa.int16()) for name in HIT_COLUMNS])
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('date', pa.string()), ('platform', pa.string())]), flavor='hive'
+)
+
+# Columns the index and aggregator read
+DEFAULT_COLUMNS = ['timestamp', 'platform', 'tickers', 'sentiment_score'] + HIT_COLUMNS
+
+class ColdStorage:
+    """
+    Date/platform-partitioned Parquet tier for closed days of sentiment_data
+    Layout: root/date=YYYY-MM-DD/platform=<name>/part-0.parquet, rows sorted
+    by timestamp so row-group statistics prune time ranges. Low-cardinality
+    columns (tickers, labels, authors) are dictionary-encoded. Rows stored
+    without lexicon hit counts are scanned on export, so files have no NULLs
+    there.
+    """
+    def __init__(self, root: str = None, row_group_size: int = 128 * 1024):
+        self.root = root or os.getenv('COLD_STORAGE_PATH', 'cold_storage')
+        self.row_group_size = row_group_size
+        self.lexicon = LexiconScanner()
+
+    def day_path(self, day: date) -> str:
+        return os.path.join(self.root, f'date={day.isoformat()}')
+
+    def day_files(self, day: date) -> List[str]:
+        """Parquet files of one exported day"""
+        files = []
+        day_dir = self.day_path(day)
+        for part in sorted(os.listdir(day_dir)):
+            if part.startswith('platform='):
+                part_dir = os.path.join(day_dir, part)
+                files += [os.path.join(part_dir, name) for name in sorted(os.listdir(part_dir))
+                          if name.endswith('.parquet') and not name.startswith(('.', '_'))]
+        return files
+
+    def exported_days(self) -> List[date]:
+        """Days with a completed export"""
+        if not os.path.isdir(self.root):
+            return []
+        days = []
+        for name in os.listdir(self.root):
+            if name.startswith('date=') and \
+                    os.path.exists(os.path.join(self.root, name, '_SUCCESS')):
+                days.append(date.fromisoformat(name[len('date='):]))
+        return sorted(days)
+
+    async def export_day(self, db, day: date) -> int:
+        """Write one (UTC) day to Parquet, one file per platform; returns rows"""
+        start = datetime.combine(day, time(), tzinfo=timezone.utc)
+        records = await db.fetch(
+            f"""
+            SELECT platform, {', '.join(SCHEMA.names)}
+            FROM sentiment_data
+            WHERE timestamp >= $1 AND timestamp < $2
+            ORDER BY platform, timestamp
+            """,
+            start, start + timedelta(days=1)
+        )
+
+        by_platform = {}
+        for record in records:
+            by_platform.setdefault(record['platform'], []).append(record)
+
+        day_dir = self.day_path(day)
+        os.makedirs(day_dir, exist_ok=True)
+        for platform, rows in by_platform.items():
+            columns = {name: [row[name] for row in rows] for name in SCHEMA.names}
+            self.fill_hits(columns)
+            table = pa.Table.from_pydict(columns, schema=SCHEMA)
+            part_dir = os.path.join(day_dir, f'platform={platform}')
+            os.makedirs(part_dir, exist_ok=True)
+            # Dot-prefixed temp file: dataset discovery skips it, and the
+            # rename means readers never see half a file
+            tmp_path = os.path.join(part_dir, '.part-0.parquet.tmp')
+            pq.write_table(table, tmp_path, row_group_size=self.row_group_size,
+                           use_dictionary=True, compression='zstd')
+            os.replace(tmp_path, os.path.join(part_dir, 'part-0.parquet'))
+
+        # Marks the day as complete (also for days with no posts)
+        open(os.path.join(day_dir, '_SUCCESS'), 'w').close()
+        return len(records)
+
+    def fill_hits(self, columns: dict):
+        """Scan content for rows without ingest-time hit counts (in place)"""
+        for i, content in enumerate(columns['content']):
+            if any(columns[name][i] is None for name in HIT_COLUMNS):
+                hits = self.lexicon.scan(content)
+                for name in HIT_COLUMNS:
+                    columns[name][i] = hits[name]
+
+    async def export_closed_days(self, db, days_back: int = 7) -> dict:
+        """Export every closed day in the last days_back not yet on disk"""
+        today = datetime.now(timezone.utc).date()
+        done = set(self.exported_days())
+        exported = {}
+        for offset in range(days_back, 0, -1):
+            day = today - timedelta(days=offset)
+            if day not in done:
+                exported[day] = await self.export_day(db, day)
+        return exported
+
+    def read(self, since: datetime, until: datetime = None,
+             tickers: Optional[List[str]] = None, platforms: Optional[List[str]] = None,
+             columns: Optional[List[str]] = None, exclude_spam: bool = True) -> pd.DataFrame:
+        """
+        Historical posts in [since, until) as a DataFrame
+        Only days with a completed export (_SUCCESS) are read; platform
+        partitions and timestamp row groups are pruned by the Parquet reader
+        (memory-mapped); the ticker filter runs on Arrow arrays
+        before anything is converted to pandas. Timestamps come back as naive
+        local time like the live frames, so FearGreedIndex and
+        TickerSentimentAggregator take the result directly.
+        """
+        since = self.to_utc(since)
+        until = self.to_utc(until or datetime.now(timezone.utc))
+        columns = list(columns or DEFAULT_COLUMNS)
+        if tickers and 'tickers' not in columns:
+            columns.append('tickers')
+
+        filters = [
+            ('timestamp', '>=', since),
+            ('timestamp', '<', until),
+        ]
+        if platforms:
+            filters.append(('platform', 'in', list(platforms)))
+        if exclude_spam:
+            filters.append(('is_spam', '=', False))
+
+        files = [path for day in self.exported_days()
+                 if since.date() <= day <= until.date() for path in self.day_files(day)]
+        if not files:
+            return pd.DataFrame(columns=columns)
+        table = pq.read_table(files, columns=columns, filters=filters,
+                              partitioning=PARTITIONING, memory_map=True)
+
+        if tickers:
+            table = self.filter_tickers(table, tickers)
+
+        data = table.to_pandas()
+        if 'platform' in data.columns:
+            data['platform'] = data['platform'].astype(str)
+        if 'timestamp' in data.columns:
+            data['timestamp'] = SentimentRingStore.local_naive_series(data['timestamp'])
+            data = data.sort_values('timestamp', ignore_index=True)
+        return data
+
+    def filter_tickers(self, table: pa.Table, tickers: List[str]) -> pa.Table:
+        """Rows whose tickers list contains any of tickers (Arrow compute)"""
+        column = table.column('tickers').combine_chunks()
+        hits = pc.is_in(pc.list_flatten(column), value_set=pa.array(tickers, pa.string()))
+        parents = pc.list_parent_indices(column)
+        # Parent indices ascend, so unique keeps row order
+        return table.take(pc.unique(pc.filter(parents, hits)))
+
+    @staticmethod
+    def to_utc(timestamp) -> datetime:
+        """Aware UTC datetime (naive values are taken as local time)"""
+        timestamp = pd.Timestamp(timestamp).to_pydatetime()
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.astimezone()
+        return timestamp.astimezone(timezone.utc)
+
+if __name__ == "__main__":
+    import asyncio
+    import asyncpg
+
+    async def main():
+        conn = await asyncpg.connect(os.getenv('DB_URL'))
+        try:
+            exported = await ColdStorage().export_closed_days(
+                conn, int(os.getenv('COLD_STORAGE_DAYS', 7)))
+            for day, rows in exported.items():
+                print(f"{day}: {rows} rows")
+        finally:
+            await conn.close()
+
+    asyncio.run(main())
@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+def pad_to(arr: np.ndarray, shape: tuple) -> np.ndarray:
+    """Zero-pad arr up to shape (new rows/columns hold no history)"""
+    out = np.zeros(shape, dtype=arr.dtype)
+    out[tuple(slice(0, n) for n in arr.shape)] = arr
+    return out
+
+class RollingLagStats:
+    """
+    Rolling sums for lagged correlation between the series of each group
+    Rows are (groups, width) arrays, one per bucket. For every window and lag
+    l it keeps sum x[t], sum x[t]^2, sum x[t-l], sum x[t-l]^2 and
+    sum x[t] (x) x[t-l] over the pairs (t, t-l) in the last `window` buckets
+    (fewer while t-l would precede the first bucket), updated by adding the new bucket and subtracting the one
+    leaving, so a push costs O(lags * groups * width^2) however long the
+    history is.
+    """
+    def __init__(self, groups: int, width: int, windows: tuple = (24, 168),
+                 max_lag: int = 6):
+        self.windows = tuple(windows)
+        self.max_lag = max_lag
+        self.ring_size = max(self.windows) + max_lag + 1
+        self.ring = np.zeros((self.ring_size, groups, width))
+        self.count = 0  # Buckets pushed
+
+        lags = max_lag + 1
+        # x[t] sums per lag: during warm-up each lag has its own set of pairs
+        self.now1 = {w: np.zeros((lags, groups, width)) for w in self.windows}
+        self.now2 = {w: np.zeros((lags, groups, width)) for w in self.windows}
+        self.s1 = {w: np.zeros((lags, groups, width)) for w in self.windows}
+        self.s2 = {w: np.zeros((lags, groups, width)) for w in self.windows}
+        self.cross = {w: np.zeros((lags, groups, width, width)) for w in self.windows}
+
+    @property
+    def shape(self) -> tuple:
+        return self.ring.shape[1:]
+
+    def resize(self, groups: int, width: int):
+        """Grow to more groups/series; new series start at zero (see backfill)"""
+        if (groups, width) == self.shape:
+            return
+        lags = self.max_lag + 1
+        self.ring = pad_to(self.ring, (self.ring_size, groups, width))
+        for w in self.windows:
+            self.now1[w] = pad_to(self.now1[w], (lags, groups, width))
+            self.now2[w] = pad_to(self.now2[w], (lags, groups, width))
+            self.s1[w] = pad_to(self.s1[w], (lags, groups, width))
+            self.s2[w] = pad_to(self.s2[w], (lags, groups, width))
+            self.cross[w] = pad_to(self.cross[w], (lags, groups, width, width))
+
+    def backfill(self, cells: Iterable[tuple]):
+        """
+        Give newly seen series a flat history at their first value
+        cells: (group, column, value); the groups' sums are rebuilt from the ring
+        """
+        groups = set()
+        for g, column, value in cells:
+            self.ring[:, g, column] = value  # Slots not yet pushed are overwritten anyway
+            groups.add(g)
+        for g in groups:
+            self.recompute(g)
+
+    def recompute(self, g: int):
+        """Rebuild one group's window sums from the ring"""
+        for w in self.windows:
+            for lag in range(self.max_lag + 1):
+                steps = np.arange(max(lag, self.count - w), self.count)
+                now = self.ring[steps % self.ring_size, g]
+                lagged = self.ring[(steps - lag) % self.ring_size, g]
+                self.now1[w][lag, g] = now.sum(axis=0)
+                self.now2[w][lag, g] = (now * now).sum(axis=0)
+                self.s1[w][lag, g] = lagged.sum(axis=0)
+                self.s2[w][lag, g] = (lagged * lagged).sum(axis=0)
+                self.cross[w][lag, g] = now.T @ lagged
+
+    def row(self, t: int) -> Optional[np.ndarray]:
+        """Row pushed at step t (None before the first push)"""
+        return self.ring[t % self.ring_size] if t >= 0 else None
+
+    def push(self, row: np.ndarray):
+        """Add one bucket: row is (groups, width)"""
+        t = self.count
+        self.ring[t % self.ring_size] = row
+        self.count += 1
+
+        for lag in range(self.max_lag + 1):
+            lagged = self.row(t - lag)
+            for w in self.windows:
+                if lagged is not None:
+                    self.now1[w][lag] += row
+                    self.now2[w][lag] += row * row
+                    self.s1[w][lag] += lagged
+                    self.s2[w][lag] += lagged * lagged
+                    self.cross[w][lag] += np.einsum('gi,gj->gij', row, lagged)
+                # Pair (t - w, t - w - lag) leaves the window
+                old, old_lagged = self.row(t - w), self.row(t - w - lag)
+                if old_lagged is not None:
+                    self.now1[w][lag] -= old
+                    self.now2[w][lag] -= old * old
+                    self.s1[w][lag] -= old_lagged
+                    self.s2[w][lag] -= old_lagged * old_lagged
+                    self.cross[w][lag] -= np.einsum('gi,gj->gij', old, old_lagged)
+
+    def correlation(self, window: int, lag: int = 0) -> np.ndarray:
+        """
+        (groups, width, width) correlation of x_i[t] with x_j[t - lag] over
+        the window; NaN where a series is constant
+        """
+        n = min(self.count - lag, window)  # (t, t - lag) pairs in the window
+        if n < 2:
+            return np.full(self.shape + self.shape[-1:], np.nan)
+        mean_now = self.now1[window][lag] / n
+        mean_lag = self.s1[window][lag] / n
+        var_now = self.now2[window][lag] / n - mean_now ** 2
+        var_lag = self.s2[window][lag] / n - mean_lag ** 2
+
+        cov = self.cross[window][lag] / n - np.einsum('gi,gj->gij', mean_now, mean_lag)
+        denom = np.sqrt(np.einsum('gi,gj->gij', np.clip(var_now, 0, None),
+                                  np.clip(var_lag, 0, None)))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / denom
+        corr[denom < 1e-12] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+class CorrelationEngine:
+    """
+    Incremental cross-platform and cross-ticker sentiment correlation
+    Fed one hourly bucket at a time (rows shaped like ticker_sentiment_hourly).
+    Values are forward-filled when a ticker/platform has no posts in a bucket,
+    and back-filled over the history before a series is first seen.
+    Per ticker it tracks correlation and lead/lag between platforms; across
+    tickers it tracks a mention-weighted sentiment series for up to
+    max_cross_tickers tickers (first seen first in, unless listed up front).
+    """
+    def __init__(self, windows: tuple = (24, 168), max_lag: int = 6,
+                 bucket_seconds: int = 3600, value: str = 'avg_sentiment',
+                 cross_tickers: Optional[list] = None, max_cross_tickers: int = 200):
+        self.windows = tuple(windows)
+        self.max_lag = max_lag
+        self.bucket_seconds = bucket_seconds
+        self.value = value
+
+        self.tickers, self.ticker_index = [], {}
+        self.platforms, self.platform_index = [], {}
+        self.platform_stats = RollingLagStats(0, 0, self.windows, max_lag)
+        self.last_values = np.zeros((0, 0))  # Forward-fill state (ticker, platform)
+        self.seen = np.zeros((0, 0), dtype=bool)  # Cells with a value so far
+
+        self.cross_tickers = list(cross_tickers or [])[:max_cross_tickers]
+        self.cross_index = {t: i for i, t in enumerate(self.cross_tickers)}
+        self.max_cross_tickers = max_cross_tickers
+        self.ticker_stats = RollingLagStats(1, max_cross_tickers, self.windows, max_lag)
+        self.last_ticker_values = np.zeros(max_cross_tickers)
+        self.ticker_seen = np.zeros(max_cross_tickers, dtype=bool)
+
+        self.last_bucket = None
+
+    def encode(self, value: str, values: list, index: dict) -> int:
+        """Position for a ticker/platform, assigned on first sight"""
+        if value not in index:
+            index[value] = len(values)
+            values.append(value)
+        return index[value]
+
+    def ingest_bucket(self, bucket_time: datetime, rows: Iterable[dict]):
+        """
+        Add one closed bucket
+        Input: rows with [ticker, platform, avg_sentiment, mention_count]
+        Buckets must arrive in order; skipped buckets repeat the last values.
+        """
+        bucket = int(bucket_time.timestamp() // self.bucket_seconds)
+        if self.last_bucket is not None and bucket <= self.last_bucket:
+            raise ValueError("buckets must be ingested in order")
+
+        cells, ticker_sums = [], {}
+        for row in rows:
+            value = row[self.value]
+            if value is None or value != value:  # NULL/NaN
+                continue
+            ticker = row['ticker']
+            g = self.encode(ticker, self.tickers, self.ticker_index)
+            p = self.encode(row['platform'], self.platforms, self.platform_index)
+            cells.append((g, p, float(value)))
+
+            if ticker not in self.cross_index and len(self.cross_tickers) < self.max_cross_tickers:
+                self.cross_index[ticker] = len(self.cross_tickers)
+                self.cross_tickers.append(ticker)
+            if ticker in self.cross_index:
+                weight = float(row.get('mention_count') or 1)
+                total = ticker_sums.setdefault(ticker, [0.0, 0.0])
+                total[0] += weight * value
+                total[1] += weight
+
+        # Grow for new tickers/platforms (amortized doubling on tickers)
+        groups, width = self.platform_stats.shape
+        if len(self.tickers) > groups or len(self.platforms) > width:
+            groups = max(len(self.tickers), 2 * groups) if len(self.tickers) > groups else groups
+            width = max(len(self.platforms), width)
+            self.platform_stats.resize(groups, width)
+            self.last_values = pad_to(self.last_values, (groups, width))
+            self.seen = pad_to(self.seen, (groups, width))
+
+        # Forward-fill over skipped buckets, then push this one
+        if self.last_bucket is not None:
+            gap = min(bucket - self.last_bucket - 1, self.platform_stats.ring_size)
+            for _ in range(gap):
+                self.platform_stats.push(self.last_values)
+                self.ticker_stats.push(self.last_ticker_values[None, :])
+
+        # A series first seen now would otherwise step up from zero history
+        first_seen = {(g, p): value for g, p, value in cells if not self.seen[g, p]}
+        self.platform_stats.backfill((g, p, value) for (g, p), value in first_seen.items())
+        for g, p, value in cells:
+            self.last_values[g, p] = value
+            self.seen[g, p] = True
+
+        first_seen = []
+        for ticker, (weighted, weight) in ticker_sums.items():
+            i = self.cross_index[ticker]
+            self.last_ticker_values[i] = weighted / weight
+            if not self.ticker_seen[i]:
+                first_seen.append((0, i, weighted / weight))
+                self.ticker_seen[i] = True
+        self.ticker_stats.backfill(first_seen)
+
+        self.platform_stats.push(self.last_values)
+        self.ticker_stats.push(self.last_ticker_values[None, :])
+        self.last_bucket = bucket
+
+    def platform_correlation(self, ticker: str, window: int = 168,
+                             lag: int = 0) -> pd.DataFrame:
+        """
+        Platform x platform correlation for a ticker over the last `window`
+        buckets; cell (a, b) correlates a now with b `lag` buckets earlier
+        """
+        self.check_query(window, lag)
+        g = self.ticker_index.get(ticker)
+        if g is None:
+            return pd.DataFrame()
+        corr = self.platform_stats.correlation(window, lag)[g]
+        return pd.DataFrame(corr[:len(self.platforms), :len(self.platforms)],
+                            index=self.platforms, columns=self.platforms)
+
+    def lead_lag(self, ticker: str, window: int = 168) -> pd.DataFrame:
+        """
+        Best lag (1..max_lag) per platform pair for a ticker
+        Returns: DataFrame [leader, follower, lag, correlation, same_bucket]
+        """
+        self.check_query(window, 0)
+        g = self.ticker_index.get(ticker)
+        if g is None or self.max_lag < 1:
+            return pd.DataFrame(columns=['leader', 'follower', 'lag', 'correlation', 'same_bucket'])
+        n = len(self.platforms)
+        # (lag, follower, leader)
+        lagged = np.stack([self.platform_stats.correlation(window, lag)[g, :n, :n]
+                           for lag in range(1, self.max_lag + 1)])
+        same_bucket = self.platform_stats.correlation(window, 0)[g, :n, :n]
+
+        rows = []
+        for follower in range(n):
+            for leader in range(n):
+                if leader == follower:
+                    continue
+                series = lagged[:, follower, leader]
+                if np.isnan(series).all():
+                    continue
+                best = int(np.nanargmax(np.abs(series)))
+                rows.append({
+                    'leader': self.platforms[leader],
+                    'follower': self.platforms[follower],
+                    'lag': best + 1,
+                    'correlation': float(series[best]),
+                    'same_bucket': float(same_bucket[follower, leader])
+                })
+        return pd.DataFrame(rows, columns=['leader', 'follower', 'lag', 'correlation', 'same_bucket'])
+
+    def ticker_correlation(self, window: int = 168, lag: int = 0,
+                           tickers: Optional[list] = None) -> pd.DataFrame:
+        """Ticker x ticker sentiment correlation (cross-ticker set only)"""
+        self.check_query(window, lag)
+        names = [t for t in (tickers or self.cross_tickers) if t in self.cross_index]
+        positions = [self.cross_index[t] for t in names]
+        corr = self.ticker_stats.correlation(window, lag)[0]
+        return pd.DataFrame(corr[np.ix_(positions, positions)], index=names, columns=names)
+
+    def check_query(self, window: int, lag: int):
+        if window not in self.windows:
+            raise ValueError(f"window must be one of {self.windows}")
+        if not 0 <= lag <= self.max_lag:
+            raise ValueError(f"lag must be between 0 and {self.max_lag}")
+
+    async def load_history(self, db, hours: int = None):
+        """Warm up from ticker_sentiment_hourly, one bucket at a time"""
+        hours = hours or max(self.windows) + self.max_lag
+        since = datetime.now() - timedelta(hours=hours)
+        records = await db.fetch(
+            """
+            SELECT bucket, ticker, platform, avg_sentiment, mention_count
+            FROM ticker_sentiment_hourly
+            WHERE bucket > $1
+            ORDER BY bucket
+            """,
+            since
+        )
+        rows, current = [], None
+        for record in records:
+            if current is not None and record['bucket'] != current:
+                self.ingest_bucket(current, rows)
+                rows = []
+            current = record['bucket']
+            rows.append(dict(record))
+        if rows:
+            self.ingest_bucket(current, rows)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+import asyncpg
+import numpy as np
+
+# Named queries, prepared once per pooled connection. Every value, including
+# interval lengths, is a bind parameter so the query text never changes.
+QUERIES = {
+    'fear_greed_history': """
+        SELECT timestamp, index_value, interpretation
+        FROM fear_greed_index
+        WHERE timestamp > NOW() - make_interval(days => $1)
+        ORDER BY timestamp DESC
+    """,
+    'fear_greed_current': """
+        SELECT timestamp, index_value, interpretation, components
+        FROM fear_greed_index
+        ORDER BY timestamp DESC
+        LIMIT 1
+    """,
+    'ticker_sentiment': """
+        SELECT
+            time_bucket('1 hour', timestamp) AS hour,
+            AVG(sentiment_score) AS avg_sentiment,
+            COUNT(*) AS volume,
+            MAX(sentiment_score) AS max_sentiment,
+            MIN(sentiment_score) AS min_sentiment
+        FROM sentiment_data
+        WHERE $1 = ANY(tickers)
+            AND timestamp > NOW() - make_interval(hours => $2)
+            AND is_spam = FALSE
+        GROUP BY hour
+        ORDER BY hour DESC
+    """,
+    'trending_tickers': """
+        SELECT
+            unnest(tickers) AS ticker,
+            COUNT(*) AS mentions,
+            AVG(sentiment_score) AS avg_sentiment
+        FROM sentiment_data
+        WHERE timestamp > NOW() - make_interval(hours => $1)
+            AND is_spam = FALSE
+        GROUP BY ticker
+        ORDER BY mentions DESC
+        LIMIT $2
+    """,
+    'unusual_activity': """
+        SELECT ticker, alert_type, severity, details, timestamp
+        FROM unusual_activity_log
+        WHERE timestamp > NOW() - make_interval(hours => $1)
+            AND severity IN ('medium', 'high')
+        ORDER BY timestamp DESC
+    """,
+    'latest_sentiment': """
+        SELECT * FROM sentiment_data
+        WHERE timestamp > NOW() - make_interval(secs => $1)
+        ORDER BY timestamp DESC
+    """,
+    # WebSocket broadcaster: tail of sentiment_data in insert (id) order.
+    # Spam rows are returned so the cursor can tell them from id gaps.
+    'stream_watermark': """
+        SELECT max(id) AS id FROM sentiment_data
+    """,
+    'stream_after': """
+        SELECT id, timestamp, platform, tickers, sentiment_score,
+               sentiment_label, confidence, is_spam
+        FROM sentiment_data
+        WHERE id > $1
+        ORDER BY id
+        LIMIT $2
+    """,
+    'stream_ids': """
+        SELECT id, timestamp, platform, tickers, sentiment_score,
+               sentiment_label, confidence, is_spam
+        FROM sentiment_data
+        WHERE id = ANY($1::bigint[])
+        ORDER BY id
+    """,
+    # Keyset pages, newest first: ($3, $4) is the last (timestamp, id) served
+    'ticker_posts_page': """
+        SELECT id, timestamp, platform, author, content, tickers,
+               sentiment_score, sentiment_label, confidence, volume_metric
+        FROM sentiment_data
+        WHERE $1 = ANY(tickers)
+            AND timestamp > NOW() - make_interval(hours => $2)
+            AND (timestamp, id) < ($3, $4)
+            AND is_spam = FALSE
+        ORDER BY timestamp DESC, id DESC
+        LIMIT $5
+    """,
+    # Streaming export (server-side cursor), optional ticker filter
+    'export_sentiment': """
+        SELECT id, timestamp, platform, source_type, content, author, tickers,
+               sentiment_score, sentiment_label, confidence, volume_metric,
+               is_spam, fear_hits, greed_hits, put_hits, call_hits
+        FROM sentiment_data
+        WHERE timestamp >= $1 AND timestamp < $2
+            AND ($3::text IS NULL OR $3 = ANY(tickers))
+            AND is_spam = FALSE
+        ORDER BY timestamp, id
+    """,
+}
+
+class StatementConnection(asyncpg.Connection):
+    """
+    Pooled connection carrying its prepared statements, by query name
+    """
+    __slots__ = ('statements',)
+
+async def prepare_statements(conn: StatementConnection):
+    """Pool init callback: prepare every named query on a new connection"""
+    conn.statements = {}
+    for name, sql in QUERIES.items():
+        conn.statements[name] = await conn.prepare(sql)
+
+class Database:
+    """
+    Sized asyncpg pool with named prepared statements and saturation metrics
+    Created at app startup (connect) and closed at shutdown. Pool bounds
+    come from DB_POOL_MIN / DB_POOL_MAX.
+    """
+    def __init__(self, dsn: str = None, min_size: int = None, max_size: int = None,
+                 command_timeout: float = 30.0, wait_samples: int = 10_000):
+        self.dsn = dsn or os.getenv('DB_URL')
+        self.min_size = min_size or int(os.getenv('DB_POOL_MIN', 5))
+        self.max_size = max_size or int(os.getenv('DB_POOL_MAX', 20))
+        self.command_timeout = command_timeout
+        self.pool = None
+
+        # Saturation metrics
+        self.waiters = 0  # Coroutines currently waiting for a connection
+        self.acquires = 0
+        self.acquire_waits = deque(maxlen=wait_samples)  # Recent waits (seconds)
+
+    async def connect(self):
+        if self.pool is None:
+            self.pool = await asyncpg.create_pool(
+                self.dsn,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                command_timeout=self.command_timeout,
+                connection_class=StatementConnection,
+                init=prepare_statements,
+            )
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Pool connection, timing how long the caller waited for it"""
+        self.waiters += 1
+        start = time.perf_counter()
+        try:
+            conn = await self.pool.acquire()
+        finally:
+            self.waiters -= 1
+        self.acquire_waits.append(time.perf_counter() - start)
+        self.acquires += 1
+        try:
+            yield conn
+        finally:
+            await self.pool.release(conn)
+
+    async def fetch(self, name: str, *args) -> list:
+        """Run a named query; returns all rows"""
+        async with self.acquire() as conn:
+            return await conn.statements[name].fetch(*args)
+
+    async def fetchrow(self, name: str, *args):
+        """Run a named query; returns the first row or None"""
+        async with self.acquire() as conn:
+            return await conn.statements[name].fetchrow(*args)
+
+    async def stream(self, name: str, *args, batch_size: int = 5000):
+        """
+        Run a named query through a server-side cursor, yielding lists of at
+        most batch_size rows; holds one pool connection until exhausted
+        """
+        async with self.acquire() as conn:
+            async with conn.transaction():
+                cursor = await conn.statements[name].cursor(*args)
+                while True:
+                    records = await cursor.fetch(batch_size)
+                    if not records:
+                        return
+                    yield records
+
+    def metrics(self) -> dict:
+        """Pool size/usage and recent acquire wait percentiles"""
+        if self.pool is None:
+            return {'connected': False}
+        waits = np.asarray(self.acquire_waits) * 1000
+        size, idle = self.pool.get_size(), self.pool.get_idle_size()
+        return {
+            'connected': True,
+            'min_size': self.pool.get_min_size(),
+            'max_size': self.pool.get_max_size(),
+            'size': size,
+            'idle': idle,
+            'in_use': size - idle,
+            'waiters': self.waiters,
+            'acquires': self.acquires,
+            'acquire_wait_p50_ms': round(float(np.percentile(waits, 50)), 3) if len(waits) else 0.0,
+            'acquire_wait_p99_ms': round(float(np.percentile(waits, 99)), 3) if len(waits) else 0.0,
+            'saturated': idle == 0 and size >= self.pool.get_max_size(),
+        }
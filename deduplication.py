@@ -1,45 +1,66 @@
 #!/usr/bin/env python
 
-from hashlib import md5
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import time
+from datetime import datetime
+from typing import Optional
+
+from fingerprint_store import RotatingFingerprintStore
+from minhash_index import MinHashLSHIndex
 
 class ContentDeduplicator:
     """
     Removes duplicate or near-duplicate content across platforms
     """
-    def __init__(self):
-        self.seen_hashes = set()
-        self.vectorizer = TfidfVectorizer()
-        self.recent_content = []  # Last 1000 items for fuzzy matching
-        
+    def __init__(self, similarity_threshold: float = 0.8, window_hours: float = 24,
+                 retention_hours: float = 48, snapshot_path: Optional[str] = None,
+                 snapshot_seconds: float = 300.0):
+        # Exact duplicates over retention_hours, restored from snapshot_path
+        # and saved to it periodically and at exit
+        self.seen_hashes = RotatingFingerprintStore(
+            retention_hours=retention_hours,
+            snapshot_path=snapshot_path,
+            snapshot_seconds=snapshot_seconds
+        )
+        # Near-duplicate index over the last window_hours of content
+        self.near_duplicates = MinHashLSHIndex(
+            threshold=similarity_threshold,
+            window_seconds=window_hours * 3600
+        )
+
     def is_duplicate(self, content: str, metadata: dict) -> bool:
         """Check if content is exact or near-duplicate"""
-        # Exact match via hash
-        content_hash = md5(content.encode()).hexdigest()
-        if content_hash in self.seen_hashes:
+        timestamp = self.get_timestamp(metadata)
+
+        # Exact match via fingerprint
+        if self.seen_hashes.check_and_add(content, timestamp):
             return True
-        self.seen_hashes.add(content_hash)
-        
+
         # Fuzzy match for cross-posts
-        if len(self.recent_content) > 0:
-            similarity = self.check_similarity(content)
-            if similarity > 0.95:  # 95% similar = duplicate
-                return True
-        
-        # Add to recent content buffer
-        self.recent_content.append(content)
-        if len(self.recent_content) > 1000:
-            self.recent_content.pop(0)
-        
+        signature = self.near_duplicates.signature(content)
+        similarity = self.near_duplicates.query(signature)
+        if similarity >= self.near_duplicates.threshold:
+            return True
+
+        # Add to the near-duplicate window
+        self.near_duplicates.insert(signature, timestamp)
+
         return False
-    
+
     def check_similarity(self, new_content: str) -> float:
         """Calculate max similarity with recent content"""
-        try:
-            corpus = self.recent_content + [new_content]
-            tfidf_matrix = self.vectorizer.fit_transform(corpus)
-            similarities = cosine_similarity(tfidf_matrix[-1], tfidf_matrix[:-1])
-            return float(similarities.max())
-        except:
-            return 0.0
+        signature = self.near_duplicates.signature(new_content)
+        return self.near_duplicates.query(signature)
+
+    def snapshot(self):
+        """Persist exact-duplicate fingerprints now (also done periodically and at exit)"""
+        if self.seen_hashes.snapshot_path:
+            self.seen_hashes.snapshot()
+
+    def get_timestamp(self, metadata: dict) -> float:
+        """Post time in epoch seconds (falls back to now)"""
+        timestamp = metadata.get('timestamp')
+        if isinstance(timestamp, datetime):
+            return timestamp.timestamp()
+        if isinstance(timestamp, (int, float)):
+            return float(timestamp)
+        return time.time()
@@ -1,59 +1,176 @@
 #!/usr/bin/env python
+import os
 import re
-from typing import List, Set
+import time
+from bisect import bisect_right
+from typing import List, Set, Tuple, Union
+
+import pandas as pd
+
+from aho_corasick import AhoCorasick, CompiledAhoCorasick
+from ticker_universe import ASCII_LOWER, AliasMap, TickerUniverse
+
+TOKEN_PATTERN = re.compile(r'\w+')
 
 class TickerExtractor:
     """
     Extracts stock tickers from unstructured text
     Handles: $CASHTAGS, company names, common misspellings
     """
-    def __init__(self):
+    def __init__(self, context_window: int = 8, universe_path: str = None,
+                 reload_interval: float = 60.0):
+        # Compiled ticker universe (see ticker_universe.py), memory-mapped
+        universe_path = universe_path or os.getenv('TICKER_UNIVERSE_PATH')
+        self.universe = TickerUniverse(universe_path) if universe_path else None
+        self.reload_interval = reload_interval  # Seconds between file checks
+        self.last_reload_check = time.monotonic()
+
         # Load ticker reference database
         self.known_tickers = self.load_ticker_database()
         self.company_to_ticker = self.load_company_mappings()
-        
+        # One automaton for symbols and company names
+        self.matcher = self.build_matcher()
+        # Financial context words and how many tokens either side to check
+        self.context_words = {'stock', 'shares', 'calls', 'puts', 'long', 'short',
+                              'buy', 'sell', 'price', 'target', 'dd', 'yolo'}
+        self.context_window = context_window
+
+    def build_matcher(self) -> Union[AhoCorasick, CompiledAhoCorasick]:
+        """Compile ticker symbols and company names into one automaton"""
+        # The universe file ships the automaton precompiled and mapped, so
+        # every worker shares it and a reload only remaps the file
+        if self.universe is not None:
+            return self.universe.matcher
+        matcher = AhoCorasick()
+        for ticker in self.known_tickers:
+            matcher.add(ticker.translate(ASCII_LOWER), ('symbol', ticker))
+        for company, ticker in self.company_to_ticker.items():
+            matcher.add(company.translate(ASCII_LOWER), ('company', ticker))
+        matcher.build()
+        return matcher
+
+    def maybe_reload(self):
+        """Pick up a rebuilt universe file (daily listing updates)"""
+        if self.universe is None:
+            return
+        now = time.monotonic()
+        if now - self.last_reload_check < self.reload_interval:
+            return
+        self.last_reload_check = now
+        if self.universe.reload_if_changed():
+            self.known_tickers = self.load_ticker_database()
+            self.company_to_ticker = self.load_company_mappings()
+            self.matcher = self.build_matcher()
+
     def extract_tickers(self, text: str) -> Set[str]:
         """Extract all valid tickers from text"""
-        tickers = set()
-        
-        # Method 1: Cashtags ($AAPL)
-        cashtags = re.findall(r'\$([A-Z]{1,5})\b', text)
-        tickers.update(t for t in cashtags if t in self.known_tickers)
-        
-        # Method 2: Standalone uppercase words (context-aware)
-        words = re.findall(r'\b([A-Z]{1,5})\b', text)
-        for word in words:
-            if word in self.known_tickers and self.is_ticker_context(text, word):
-                tickers.add(word)
-        
-        # Method 3: Company name matching
-        text_lower = text.lower()
-        for company, ticker in self.company_to_ticker.items():
-            if company in text_lower:
-                tickers.add(ticker)
-        
-        return tickers
-    
-    def is_ticker_context(self, text: str, word: str) -> bool:
+        self.maybe_reload()
+        return {ticker for ticker, _ in self.find_tickers(text)}
+
+    def extract_tickers_batch(self, texts: Union[List[str], pd.Series]) -> pd.DataFrame:
+        """
+        Extract tickers from many posts
+        Returns one row per mention: (post_index, ticker, offset), where
+        post_index is the position of the post in texts
+        """
+        self.maybe_reload()
+        post_index, tickers, offsets = [], [], []
+        for i, text in enumerate(texts):
+            if not isinstance(text, str):
+                continue  # NaN / None content
+            for ticker, offset in self.find_tickers(text):
+                post_index.append(i)
+                tickers.append(ticker)
+                offsets.append(offset)
+
+        return pd.DataFrame({
+            'post_index': pd.array(post_index, dtype='int64'),
+            'ticker': pd.array(tickers, dtype='string'),
+            'offset': pd.array(offsets, dtype='int64')
+        })
+
+    def to_ticker_lists(self, mentions: pd.DataFrame, n_posts: int) -> List[List[str]]:
+        """Collapse batch mentions into a per-post `tickers` column"""
+        lists = [[] for _ in range(n_posts)]
+        for i, ticker in zip(mentions['post_index'].tolist(), mentions['ticker'].tolist()):
+            if ticker not in lists[i]:
+                lists[i].append(ticker)
+        return lists
+
+    def find_tickers(self, text: str) -> List[Tuple[str, int]]:
+        """
+        All ticker mentions in text as (ticker, character offset)
+        Overlapping names for one ticker at one offset ('apple',
+        'apple computer') count as a single mention.
+        """
+        mentions = []
+        found = set()  # (ticker, start) already reported
+        text_lower = text.translate(ASCII_LOWER)
+        tokens = None  # Tokenized on first bare-symbol candidate
+
+        # Single pass finds cashtags, bare symbols and company names
+        for start, end, (kind, ticker) in self.matcher.find(text_lower):
+            if not self.is_word_boundary(text, start, end):
+                continue
+
+            if (ticker, start) in found:
+                continue
+
+            # Method 3: Company name matching
+            if kind == 'company':
+                mentions.append((ticker, start))
+                found.add((ticker, start))
+                continue
+
+            # Symbols must appear in uppercase
+            if text[start:end] != ticker:
+                continue
+
+            # Method 1: Cashtags ($AAPL)
+            if start > 0 and text[start - 1] == '$':
+                mentions.append((ticker, start))
+                found.add((ticker, start))
+                continue
+
+            # Method 2: Standalone uppercase words (context-aware)
+            if tokens is None:
+                tokens = [(m.start(), m.group()) for m in TOKEN_PATTERN.finditer(text_lower)]
+                token_starts = [pos for pos, _ in tokens]
+            position = bisect_right(token_starts, start) - 1
+            if self.is_ticker_context(tokens, position):
+                mentions.append((ticker, start))
+                found.add((ticker, start))
+
+        return mentions
+
+    def is_word_boundary(self, text: str, start: int, end: int) -> bool:
+        """Match is not embedded in a longer word"""
+        before = text[start - 1] if start > 0 else ' '
+        after = text[end] if end < len(text) else ' '
+        return not (before.isalnum() or before == '_' or
+                    after.isalnum() or after == '_')
+
+    def is_ticker_context(self, tokens: List[Tuple[int, str]], position: int) -> bool:
         """Determine if uppercase word is likely a ticker vs acronym"""
-        # Check for financial context words nearby
-        context_words = ['stock', 'shares', 'calls', 'puts', 'long', 'short', 
-                        'buy', 'sell', 'price', 'target', 'dd', 'yolo']
-        text_lower = text.lower()
-        return any(cw in text_lower for cw in context_words)
-    
+        # Check for financial context words within a window of tokens
+        lo = max(position - self.context_window, 0)
+        hi = position + self.context_window + 1
+        return any(token in self.context_words for _, token in tokens[lo:hi])
+
     def load_ticker_database(self) -> Set[str]:
         """Load valid ticker symbols"""
-        # In production: load from database or file
-        # Include NYSE, NASDAQ, major international exchanges
-        return {'AAPL', 'MSFT', 'GOOGL', 'TSLA', 'AMC', 'GME', ...}
-    
+        # Memory-mapped universe: NYSE, NASDAQ, major international exchanges
+        if self.universe is not None:
+            return self.universe
+        return {'AAPL', 'MSFT', 'GOOGL', 'TSLA', 'AMC', 'GME'}
+
     def load_company_mappings(self) -> dict:
         """Map company names to tickers"""
+        if self.universe is not None:
+            return AliasMap(self.universe)
         return {
             'apple': 'AAPL',
             'microsoft': 'MSFT',
             'tesla': 'TSLA',
             'gamestop': 'GME',
-            ...
         }
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import AsyncIterator, List
+
+from response_cache import ResponseCache
+
+# Arrow IPC end-of-stream marker (continuation token + zero length)
+ARROW_EOS = b'\xff\xff\xff\xff\x00\x00\x00\x00'
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Opaque keyset cursor for the (timestamp, id) of the last row served"""
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> tuple:
+    """(timestamp, id) from encode_cursor; ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+
+async def ndjson_stream(batches: AsyncIterator[List]) -> AsyncIterator[bytes]:
+    """One JSON object per line, one chunk per cursor batch"""
+    async for records in batches:
+        yield ''.join(
+            json.dumps(dict(record.items()), default=ResponseCache.encode) + '\n'
+            for record in records
+        ).encode()
+
+async def arrow_stream(batches: AsyncIterator[List]) -> AsyncIterator[bytes]:
+    """
+    Arrow IPC stream: schema message, one record batch per cursor batch,
+    end-of-stream marker (read with pyarrow.ipc.open_stream)
+    """
+    import pyarrow as pa
+    from cold_storage import SCHEMA
+
+    schema = SCHEMA.insert(2, pa.field('platform', pa.string()))
+    yield schema.serialize().to_pybytes()
+    async for records in batches:
+        batch = pa.RecordBatch.from_pydict(
+            {name: [record[name] for record in records] for name in schema.names},
+            schema=schema
+        )
+        yield batch.serialize().to_pybytes()
+    yield ARROW_EOS
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+import atexit
+import os
+import time
+from collections import deque
+from hashlib import blake2b
+from typing import Optional
+
+import numpy as np
+
+class RotatingFingerprintStore:
+    """
+    Exact-duplicate store of 64-bit content fingerprints over a retention window
+    Fingerprints are grouped into time generations. The open generation is a
+    set; sealed generations are sorted uint64 arrays (8 bytes per post) that
+    drop off as they age out, so memory stays flat under sustained load.
+    With snapshot_path, generations are saved on rotation, every
+    snapshot_seconds and at interpreter exit, and restored on start.
+    """
+    def __init__(self, retention_hours: float = 48, generations: int = 8,
+                 snapshot_path: Optional[str] = None, snapshot_seconds: float = 300.0):
+        self.generation_seconds = retention_hours * 3600 / generations
+        self.generations = generations
+        self.snapshot_path = snapshot_path
+        self.snapshot_seconds = snapshot_seconds
+        self.last_snapshot = time.monotonic()
+
+        self.current = set()  # Open generation
+        self.current_gen = None  # Generation number of the open set
+        self.sealed = deque()  # (generation number, sorted uint64 array)
+
+        if snapshot_path:
+            if os.path.exists(snapshot_path):
+                self.restore(snapshot_path)
+            atexit.register(self.snapshot)
+
+    def __len__(self):
+        return len(self.current) + sum(len(arr) for _, arr in self.sealed)
+
+    @staticmethod
+    def fingerprint(content: str) -> int:
+        """64-bit content fingerprint"""
+        return int.from_bytes(blake2b(content.encode(), digest_size=8).digest(), 'little')
+
+    def contains(self, fp: int) -> bool:
+        """Whether the fingerprint was seen within the retention window"""
+        if fp in self.current:
+            return True
+        key = np.uint64(fp)
+        for _, arr in self.sealed:
+            i = np.searchsorted(arr, key)
+            if i < len(arr) and arr[i] == key:
+                return True
+        return False
+
+    def check_and_add(self, content: str, timestamp: float) -> bool:
+        """Return True if content was already seen, otherwise record it"""
+        self.rotate(timestamp)
+        fp = self.fingerprint(content)
+        if self.contains(fp):
+            return True
+        self.current.add(fp)
+        if self.snapshot_path and \
+                time.monotonic() - self.last_snapshot >= self.snapshot_seconds:
+            self.snapshot()
+        return False
+
+    def rotate(self, timestamp: float):
+        """Seal the open generation once time moves past it"""
+        gen = int(timestamp // self.generation_seconds)
+        if self.current_gen is None:
+            self.current_gen = gen
+        if gen <= self.current_gen:
+            return  # Same generation (or a late post)
+
+        if self.current:
+            arr = np.fromiter(self.current, dtype=np.uint64, count=len(self.current))
+            arr.sort()
+            self.sealed.append((self.current_gen, arr))
+        self.current = set()
+        self.current_gen = gen
+
+        # Drop generations that fell out of the retention window
+        while self.sealed and self.sealed[0][0] <= gen - self.generations:
+            self.sealed.popleft()
+
+        if self.snapshot_path:
+            self.snapshot()
+
+    def snapshot(self, path: Optional[str] = None):
+        """Write all generations to a local file (atomic replace)"""
+        path = path or self.snapshot_path
+        current = np.fromiter(self.current, dtype=np.uint64, count=len(self.current))
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                current_gen=np.int64(-1 if self.current_gen is None else self.current_gen),
+                current=current,
+                sealed_gens=np.array([g for g, _ in self.sealed], dtype=np.int64),
+                sealed_sizes=np.array([len(a) for _, a in self.sealed], dtype=np.int64),
+                sealed=(np.concatenate([a for _, a in self.sealed])
+                        if self.sealed else np.empty(0, dtype=np.uint64))
+            )
+        os.replace(tmp_path, path)
+        self.last_snapshot = time.monotonic()
+
+    def restore(self, path: str):
+        """Load generations written by snapshot()"""
+        with np.load(path) as data:
+            current_gen = int(data['current_gen'])
+            self.current_gen = None if current_gen < 0 else current_gen
+            self.current = set(data['current'].tolist())
+            offsets = np.cumsum(data['sealed_sizes'])[:-1]
+            self.sealed = deque(
+                zip(data['sealed_gens'].tolist(), np.split(data['sealed'], offsets))
+            )
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from lexicon import LexiconScanner
+
+HIT_COLUMNS = ['fear_hits', 'greed_hits', 'put_hits', 'call_hits']
+
+class SentimentRingStore:
+    """
+    In-process columnar hot store for the trailing N days of sentiment
+    Columns are NumPy ring buffers. Every row is written twice (at slot and
+    slot + capacity), so any live time range is one contiguous slice and
+    reads are views, never copies. Rows must be appended in timestamp order.
+    Timestamps are kept as naive local time, like the datetime.now()
+    comparisons in indices.py and ticker_sentiment.py.
+    """
+    def __init__(self, capacity: int = 1_000_000, retention_days: float = 7,
+                 max_tickers: int = 4):
+        self.capacity = capacity
+        self.retention = np.timedelta64(int(retention_days * 86400), 's')
+        self.max_tickers = max_tickers
+
+        size = 2 * capacity  # Mirrored halves
+        self.timestamp = np.zeros(size, dtype='datetime64[ns]')
+        self.platform_id = np.zeros(size, dtype=np.uint8)
+        self.ticker_ids = np.full((size, max_tickers), -1, dtype=np.int32)
+        self.sentiment_score = np.zeros(size, dtype=np.float32)
+        self.hits = {name: np.zeros(size, dtype=np.int16) for name in HIT_COLUMNS}
+        self.lexicon = LexiconScanner()  # For posts without ingest-time counts
+
+        # Dictionaries for the id columns
+        self.platforms, self.platform_index = [], {}
+        self.tickers, self.ticker_index = [], {}
+
+        self.head = 0  # Logical position of the next write
+        self.size = 0  # Live rows
+
+    def __len__(self):
+        return self.size
+
+    def encode(self, value: str, values: list, index: dict) -> int:
+        """Dictionary id for a platform/ticker, assigned on first sight"""
+        if value not in index:
+            index[value] = len(values)
+            values.append(value)
+        return index[value]
+
+    def append(self, post: dict):
+        """
+        Append one processed post
+        Input: dict with [timestamp, platform, tickers, sentiment_score] and
+        the ingest-time hit counts; missing/NULL counts are scanned from
+        [content] if present, else stored as 0
+        """
+        timestamp = np.datetime64(self.local_naive(post['timestamp']), 'ns')
+        if self.size and timestamp < self.last_timestamp():
+            raise ValueError("rows must be appended in timestamp order")
+
+        ticker_ids = [self.encode(t, self.tickers, self.ticker_index)
+                      for t in (post.get('tickers') or [])[:self.max_tickers]]
+        ticker_ids += [-1] * (self.max_tickers - len(ticker_ids))
+        platform_id = self.encode(post['platform'], self.platforms, self.platform_index)
+        hits = (self.lexicon.hits(post) if 'content' in post
+                else {name: post.get(name) or 0 for name in HIT_COLUMNS})
+
+        for slot in self.slots():
+            self.timestamp[slot] = timestamp
+            self.platform_id[slot] = platform_id
+            self.ticker_ids[slot] = ticker_ids
+            self.sentiment_score[slot] = post['sentiment_score']
+            for name in HIT_COLUMNS:
+                self.hits[name][slot] = hits[name]
+        self.advance(1, timestamp)
+
+    def append_frame(self, data: pd.DataFrame):
+        """Append a frame of processed posts (same columns as append)"""
+        for offset in range(0, len(data), self.capacity):
+            self.append_chunk(data.iloc[offset:offset + self.capacity])
+
+    def append_chunk(self, data: pd.DataFrame):
+        n = len(data)
+        if n == 0:
+            return
+        timestamps = self.local_naive_series(data['timestamp']).to_numpy('datetime64[ns]')
+        if (np.diff(timestamps) < np.timedelta64(0)).any() or \
+                (self.size and timestamps[0] < self.last_timestamp()):
+            raise ValueError("rows must be appended in timestamp order")
+
+        platform_ids = np.array(
+            [self.encode(p, self.platforms, self.platform_index) for p in data['platform']],
+            dtype=np.uint8
+        )
+        ticker_ids = np.full((n, self.max_tickers), -1, dtype=np.int32)
+        for row, tickers in enumerate(data['tickers']):
+            for col, ticker in enumerate((tickers or [])[:self.max_tickers]):
+                ticker_ids[row, col] = self.encode(ticker, self.tickers, self.ticker_index)
+        scores = data['sentiment_score'].to_numpy(np.float32)
+        if 'content' in data.columns:
+            hits = self.lexicon.fill_frame(data)
+        else:
+            hits = pd.DataFrame({name: data[name] if name in data.columns else 0
+                                 for name in HIT_COLUMNS}, index=data.index).fillna(0)
+        hits = {name: hits[name].to_numpy(np.int16) for name in HIT_COLUMNS}
+
+        # Physical slots for this chunk, in both halves
+        slots = (self.head + np.arange(n)) % self.capacity
+        for mirror in (slots, slots + self.capacity):
+            self.timestamp[mirror] = timestamps
+            self.platform_id[mirror] = platform_ids
+            self.ticker_ids[mirror] = ticker_ids
+            self.sentiment_score[mirror] = scores
+            for name in HIT_COLUMNS:
+                self.hits[name][mirror] = hits[name]
+        self.advance(n, timestamps[-1])
+
+    def slots(self) -> tuple:
+        slot = self.head % self.capacity
+        return slot, slot + self.capacity
+
+    def advance(self, n: int, newest: np.datetime64):
+        """Move the head and drop rows past capacity or retention"""
+        self.head += n
+        self.size = min(self.size + n, self.capacity)
+        start, stop = self.bounds()
+        expired = np.searchsorted(self.timestamp[start:stop], newest - self.retention,
+                                  side='right')
+        self.size -= int(expired)
+
+    def bounds(self) -> tuple:
+        """Physical [start, stop) of the live rows (always contiguous)"""
+        start = (self.head - self.size) % self.capacity
+        return start, start + self.size
+
+    def last_timestamp(self) -> np.datetime64:
+        return self.timestamp[(self.head - 1) % self.capacity]
+
+    def slice(self, since=None, until=None) -> dict:
+        """Column views for rows in (since, until] (no copies)"""
+        start, stop = self.bounds()
+        timestamps = self.timestamp[start:stop]
+        lo = 0 if since is None else np.searchsorted(
+            timestamps, np.datetime64(self.local_naive(since), 'ns'), side='right')
+        hi = len(timestamps) if until is None else np.searchsorted(
+            timestamps, np.datetime64(self.local_naive(until), 'ns'), side='right')
+        lo, hi = start + lo, start + hi
+        columns = {
+            'timestamp': self.timestamp[lo:hi],
+            'platform_id': self.platform_id[lo:hi],
+            'ticker_ids': self.ticker_ids[lo:hi],
+            'sentiment_score': self.sentiment_score[lo:hi],
+        }
+        columns.update({name: arr[lo:hi] for name, arr in self.hits.items()})
+        return columns
+
+    def frame(self, since=None, until=None, with_tickers: bool = True,
+              ticker: str = None) -> pd.DataFrame:
+        """
+        Rows in (since, until] as the DataFrame the index and aggregator take:
+        [timestamp, platform, tickers, sentiment_score, *_hits]
+        ticker: only rows mentioning this ticker (filtered before copying)
+        """
+        columns = self.slice(since, until)
+        if ticker is not None:
+            ticker_id = self.ticker_index.get(ticker)
+            rows = (np.flatnonzero((columns['ticker_ids'] == ticker_id).any(axis=1))
+                    if ticker_id is not None else np.empty(0, dtype=np.intp))
+            columns = {name: arr[rows] for name, arr in columns.items()}
+        platforms = np.array(self.platforms, dtype=object)
+        data = pd.DataFrame({
+            'timestamp': columns['timestamp'],
+            'platform': platforms[columns['platform_id']],
+            'sentiment_score': columns['sentiment_score'],
+            **{name: columns[name] for name in HIT_COLUMNS},
+        }, copy=False)
+        if with_tickers:
+            names = np.array(self.tickers, dtype=object)
+            data['tickers'] = [list(names[row[row >= 0]]) for row in columns['ticker_ids']]
+        return data
+
+    def exploded(self, since=None, until=None) -> pd.DataFrame:
+        """One row per (post, ticker): [timestamp, platform, sentiment_score, ticker]"""
+        columns = self.slice(since, until)
+        rows, cols = np.nonzero(columns['ticker_ids'] >= 0)
+        platforms = np.array(self.platforms, dtype=object)
+        tickers = np.array(self.tickers, dtype=object)
+        return pd.DataFrame({
+            'timestamp': columns['timestamp'][rows],
+            'platform': platforms[columns['platform_id'][rows]],
+            'sentiment_score': columns['sentiment_score'][rows],
+            'ticker': tickers[columns['ticker_ids'][rows, cols]],
+        })
+
+    @staticmethod
+    def local_naive(timestamp) -> datetime:
+        """Naive local time for a datetime/Timestamp (tz-aware is converted)"""
+        timestamp = pd.Timestamp(timestamp).to_pydatetime()
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone().replace(tzinfo=None)
+        return timestamp
+
+    @staticmethod
+    def local_naive_series(timestamps: pd.Series) -> pd.Series:
+        timestamps = pd.to_datetime(timestamps)
+        if timestamps.dt.tz is not None:
+            local_tz = datetime.now().astimezone().tzinfo
+            timestamps = timestamps.dt.tz_convert(local_tz).dt.tz_localize(None)
+        return timestamps
@@ -1,9 +1,14 @@
 #!/usr/bin/env python
 
-indices.py
+import json
+import math
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
+from hot_store import SentimentRingStore
+from lexicon import LexiconScanner
+
 class FearGreedIndex:
     """
     Constructs a custom Fear & Greed index from sentiment data
@@ -17,13 +22,18 @@ class FearGreedIndex:
             'put_call_mentions': 0.10,    # Options sentiment
             'volatility_mentions': 0.10,  # Fear keywords
         }
+        # Fear/greed/put/call keywords, normally scanned once at ingest
+        self.lexicon = LexiconScanner()
         
     def calculate(self, data: pd.DataFrame, window='1H') -> float:
         """
         Calculate current fear/greed index value
         Input: DataFrame with columns [timestamp, sentiment, ticker, platform]
+               or a SentimentRingStore
         """
         now = datetime.now()
+        if isinstance(data, SentimentRingStore):
+            data = data.frame(since=now - timedelta(days=7), with_tickers=False)
         recent_data = data[data['timestamp'] > now - timedelta(hours=1)]
         
         if len(recent_data) == 0:
@@ -89,15 +99,16 @@ class FearGreedIndex:
         change = last_sentiment - prev_sentiment
         return max(min(change, 1.0), -1.0)  # Clamp to [-1, 1]
     
+    def keyword_hits(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Ingest-time hit columns, scanning content for rows without them"""
+        return self.lexicon.fill_frame(data)
+
     def analyze_options_sentiment(self, data: pd.DataFrame) -> float:
         """Analyze put/call mentions (0-100 scale)"""
-        put_keywords = ['put', 'puts', 'puts']
-        call_keywords = ['call', 'calls', 'calls']
+        hits = self.keyword_hits(data)
         
-        data['content_lower'] = data['content'].str.lower()
-        
-        put_count = data['content_lower'].str.contains('|'.join(put_keywords)).sum()
-        call_count = data['content_lower'].str.contains('|'.join(call_keywords)).sum()
+        put_count = (hits['put_hits'] > 0).sum()
+        call_count = (hits['call_hits'] > 0).sum()
         
         if put_count + call_count == 0:
             return 50.0  # Neutral
@@ -108,19 +119,10 @@ class FearGreedIndex:
     
     def analyze_fear_keywords(self, data: pd.DataFrame) -> float:
         """Analyze fear/greed keywords (0-100 scale)"""
-        fear_keywords = ['crash', 'tank', 'dump', 'fear', 'panic', 'sell', 'bearish']
-        greed_keywords = ['moon', 'rocket', 'bull', 'rally', 'buy', 'lambo', 'breakout']
-        
-        data['content_lower'] = data['content'].str.lower()
+        hits = self.keyword_hits(data)
         
-        fear_mentions = sum(
-            data['content_lower'].str.contains(kw).sum() 
-            for kw in fear_keywords
-        )
-        greed_mentions = sum(
-            data['content_lower'].str.contains(kw).sum() 
-            for kw in greed_keywords
-        )
+        fear_mentions = hits['fear_hits'].sum()
+        greed_mentions = hits['greed_hits'].sum()
         
         total = fear_mentions + greed_mentions
         if total == 0:
@@ -129,6 +131,77 @@ class FearGreedIndex:
         greed_ratio = greed_mentions / total
         return greed_ratio * 100
     
+    def keyword_counts(self, post: dict) -> tuple:
+        """
+        Per-post keyword counts, same rules as the DataFrame analyzers
+        Uses the post's ingest-time hit counts unless missing/NULL.
+        Returns: (put post, call post, fear mentions, greed mentions)
+        """
+        hits = self.lexicon.hits(post)
+        return (
+            int(hits['put_hits'] > 0),
+            int(hits['call_hits'] > 0),
+            hits['fear_hits'],
+            hits['greed_hits'],
+        )
+
+    def score_components(self, count, scored, sentiment_sum, prev_scored,
+                         prev_sentiment_sum, week_count, put_posts, call_posts,
+                         fear_mentions, greed_mentions) -> dict:
+        """
+        Component scores and index value from window sums
+        scored/prev_scored count the posts with a (non-NULL) sentiment score,
+        which sentiment_sum/prev_sentiment_sum add up; count is all posts.
+        Works on scalars or NumPy arrays (one element per evaluation time).
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Component 1: Average Sentiment (-1 to +1 → 0 to 100)
+            # Neutral (50) when the window has no scored posts, never NaN
+            avg_sentiment = np.where(scored > 0, sentiment_sum / scored, 0.0)
+            sentiment_component = (avg_sentiment + 1) * 50
+
+            # Component 2: Volume vs Baseline (posts/hour over 7 days)
+            baseline_volume = week_count / (7 * 24)
+            volume_ratio = np.where(baseline_volume > 0, count / baseline_volume, 1.0)
+            volume_component = np.minimum(volume_ratio * 50, 100)
+
+            # Component 3: Momentum (last hour vs previous hour)
+            momentum = np.where(
+                (scored > 0) & (prev_scored > 0),
+                np.clip(avg_sentiment - prev_sentiment_sum / prev_scored, -1.0, 1.0),
+                0.0
+            )
+            momentum_component = (momentum + 1) * 50
+
+            # Component 4: Put/Call Sentiment
+            options = put_posts + call_posts
+            put_call_component = np.where(options > 0, call_posts / options * 100, 50.0)
+
+            # Component 5: Volatility/Fear Keywords
+            keywords = fear_mentions + greed_mentions
+            volatility_component = np.where(
+                keywords > 0, greed_mentions / keywords * 100, 50.0
+            )
+
+        index_value = (
+            sentiment_component * self.weights['sentiment_score'] +
+            volume_component * self.weights['volume'] +
+            momentum_component * self.weights['momentum'] +
+            put_call_component * self.weights['put_call_mentions'] +
+            volatility_component * self.weights['volatility_mentions']
+        )
+        # Neutral if no data in the last hour
+        index_value = np.where(count > 0, np.round(index_value, 2), 50.0)
+
+        return {
+            'index_value': index_value,
+            'sentiment_score': sentiment_component,
+            'volume': volume_component,
+            'momentum': momentum_component,
+            'put_call_mentions': put_call_component,
+            'volatility_mentions': volatility_component,
+        }
+
     def get_interpretation(self, index_value: float) -> str:
         """Human-readable interpretation"""
         if index_value >= 80:
@@ -141,3 +214,180 @@ class FearGreedIndex:
             return "Fear"
         else:
             return "Extreme Fear"
+
+    def calculate_range(self, data: pd.DataFrame, start, end, step='1min') -> pd.DataFrame:
+        """
+        Index value and components at every step in [start, end]
+        Posts are binned once at step resolution; every window sum comes from
+        cumulative bin sums, so the whole range is one vectorized pass.
+        Only posts up to each evaluation time count towards it.
+        Input: DataFrame as for calculate, or a SentimentRingStore
+        Returns: DataFrame indexed by timestamp
+        """
+        if isinstance(data, SentimentRingStore):
+            data = data.frame(since=pd.Timestamp(start) - timedelta(days=7),
+                              until=end, with_tickers=False)
+        step = pd.Timedelta(step)
+        if pd.Timedelta(hours=1) % step != pd.Timedelta(0):
+            raise ValueError("step must divide one hour")
+        hour = pd.Timedelta(hours=1) // step
+        week = 7 * 24 * hour
+
+        times = pd.date_range(pd.Timestamp(start), pd.Timestamp(end), freq=step)
+        if len(times) == 0:
+            return pd.DataFrame()
+
+        # Bin j covers (origin + (j-1)*step, origin + j*step]; time i is bin week + i
+        origin = times[0] - week * step
+        last_bin = week + len(times) - 1
+        bins = np.ceil((data['timestamp'] - origin) / step).to_numpy()
+        keep = (bins >= 1) & (bins <= last_bin)
+        bins = bins[keep].astype(np.int64)
+
+        hits = self.keyword_hits(data)[keep]
+        # NULL scores count as posts but not towards the sentiment mean
+        scores = data['sentiment_score'].to_numpy(dtype=np.float64, na_value=np.nan)[keep]
+        scored = np.isfinite(scores)
+        columns = {
+            'count': np.ones(len(bins)),
+            'scored': scored,
+            'sentiment_sum': np.where(scored, scores, 0.0),
+            'put_posts': (hits['put_hits'] > 0).to_numpy(),
+            'call_posts': (hits['call_hits'] > 0).to_numpy(),
+            'fear_mentions': hits['fear_hits'].to_numpy(),
+            'greed_mentions': hits['greed_hits'].to_numpy(),
+        }
+        # Cumulative sums over bins: window (e - w, e] = cum[e] - cum[e - w]
+        cum = {
+            name: np.cumsum(np.bincount(bins, weights=values, minlength=last_bin + 1))
+            for name, values in columns.items()
+        }
+        ends = np.arange(week, last_bin + 1)
+
+        def window(name, lag, width):
+            return cum[name][ends - lag] - cum[name][ends - lag - width]
+
+        components = self.score_components(
+            count=window('count', 0, hour),
+            scored=window('scored', 0, hour),
+            sentiment_sum=window('sentiment_sum', 0, hour),
+            prev_scored=window('scored', hour, hour),
+            prev_sentiment_sum=window('sentiment_sum', hour, hour),
+            week_count=window('count', 0, week),
+            put_posts=window('put_posts', 0, hour),
+            call_posts=window('call_posts', 0, hour),
+            fear_mentions=window('fear_mentions', 0, hour),
+            greed_mentions=window('greed_mentions', 0, hour)
+        )
+
+        result = pd.DataFrame(components, index=times)
+        result.index.name = 'timestamp'
+        value = result['index_value']
+        result.insert(1, 'interpretation', np.select(
+            [value >= 80, value >= 60, value >= 40, value >= 20],
+            ["Extreme Greed", "Greed", "Neutral", "Fear"],
+            default="Extreme Fear"
+        ))
+        return result
+
+    async def store_range(self, db, results: pd.DataFrame, chunk_size: int = 5000,
+                          cache=None):
+        """
+        Bulk upsert calculate_range output into fear_greed_index
+        Pass the API's ResponseCache to invalidate cached fear-greed responses.
+        """
+        query = """
+            INSERT INTO fear_greed_index (timestamp, index_value, interpretation, components)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (timestamp) DO UPDATE
+            SET index_value = EXCLUDED.index_value,
+                interpretation = EXCLUDED.interpretation,
+                components = EXCLUDED.components
+        """
+        component_names = list(self.weights)
+        records = [
+            (timestamp.to_pydatetime(), float(row.index_value), row.interpretation,
+             json.dumps({name: round(float(getattr(row, name)), 4)
+                         for name in component_names}, allow_nan=False))
+            for timestamp, row in zip(results.index, results.itertuples(index=False))
+        ]
+        for offset in range(0, len(records), chunk_size):
+            await db.executemany(query, records[offset:offset + chunk_size])
+        if cache is not None and records:
+            await cache.invalidate('fear_greed')
+
+
+class StreamingFearGreedIndex(FearGreedIndex):
+    """
+    Incremental Fear & Greed index over rolling time buckets
+    Each post updates its bucket's sums as it arrives; emitting the index
+    sums buckets (O(buckets)), never rows, however much history is kept.
+    """
+    # Accumulator columns per bucket
+    FIELDS = ['count', 'scored', 'sentiment_sum', 'put_posts', 'call_posts',
+              'fear_mentions', 'greed_mentions']
+
+    def __init__(self, bucket_seconds: int = 60, history_days: int = 7):
+        super().__init__()
+        if 3600 % bucket_seconds != 0:
+            raise ValueError("bucket_seconds must divide one hour")
+        self.bucket_seconds = bucket_seconds
+        self.hour_buckets = 3600 // bucket_seconds
+        self.week_buckets = 7 * 24 * self.hour_buckets
+        self.n_buckets = max(history_days * 24 * self.hour_buckets, self.week_buckets)
+
+        # Ring of buckets: slot -> absolute bucket number and its sums
+        self.bucket_ids = np.full(self.n_buckets, -1, dtype=np.int64)
+        self.sums = np.zeros((self.n_buckets, len(self.FIELDS)))
+
+    def update(self, post: dict):
+        """
+        Add one post to its bucket
+        Input: dict with [timestamp, sentiment_score] plus either the
+        ingest-time [fear_hits, greed_hits, put_hits, call_hits] or [content]
+        """
+        bucket = int(self.to_seconds(post['timestamp']) // self.bucket_seconds)
+        slot = bucket % self.n_buckets
+        if self.bucket_ids[slot] != bucket:
+            if self.bucket_ids[slot] > bucket:
+                return  # Older than the retained history
+            self.bucket_ids[slot] = bucket
+            self.sums[slot] = 0.0
+
+        put, call, fear, greed = self.keyword_counts(post)
+        # NULL scores count as posts but not towards the sentiment mean
+        score = post.get('sentiment_score')
+        scored = score is not None and math.isfinite(score)
+        self.sums[slot] += (1, scored, score if scored else 0.0, put, call, fear, greed)
+
+    def emit(self, now: datetime = None) -> dict:
+        """Current index value and components from bucket sums"""
+        now_bucket = int(self.to_seconds(now or datetime.now()) // self.bucket_seconds)
+        age = now_bucket - self.bucket_ids
+        valid = (self.bucket_ids >= 0) & (age >= 0)
+
+        last_hour = self.sums[valid & (age < self.hour_buckets)].sum(axis=0)
+        prev_hour = self.sums[
+            valid & (age >= self.hour_buckets) & (age < 2 * self.hour_buckets)
+        ].sum(axis=0)
+        week = self.sums[valid & (age < self.week_buckets)].sum(axis=0)
+
+        components = self.score_components(
+            count=last_hour[0], scored=last_hour[1], sentiment_sum=last_hour[2],
+            prev_scored=prev_hour[1], prev_sentiment_sum=prev_hour[2],
+            week_count=week[0], put_posts=last_hour[3], call_posts=last_hour[4],
+            fear_mentions=last_hour[5], greed_mentions=last_hour[6]
+        )
+        components = {name: float(value) for name, value in components.items()}
+        index_value = components.pop('index_value')
+        return {
+            'index_value': index_value,
+            'interpretation': self.get_interpretation(index_value),
+            'components': components
+        }
+
+    def to_seconds(self, timestamp) -> float:
+        """Epoch seconds from a datetime/Timestamp/number"""
+        if isinstance(timestamp, (int, float)):
+            return float(timestamp)
+        return timestamp.timestamp()
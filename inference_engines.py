@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+
+import gc
+import os
+import statistics
+import time
+from typing import List
+
+import numpy as np
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+class TorchEngine:
+    """
+    Eager PyTorch inference (reference implementation)
+    """
+    name = 'torch'
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = self.load_model()
+        self.model.eval()  # Inference only (disables dropout)
+
+    def load_model(self):
+        """Load the model onto the inference device"""
+        # Use GPU if available
+        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        return model.to(self.device)
+
+    def predict(self, texts: List[str]) -> torch.Tensor:
+        """Class probabilities for a padded batch of texts"""
+        inputs = self.tokenizer(texts, return_tensors="pt", padding=True,
+                                truncation=True, max_length=512).to(self.device)
+        with torch.inference_mode():
+            logits = self.model(**inputs).logits
+        return torch.nn.functional.softmax(logits, dim=-1).cpu()
+
+class QuantizedTorchEngine(TorchEngine):
+    """
+    Dynamically int8-quantized PyTorch model (CPU only)
+    Linear layers run in int8; roughly 4x smaller and 2x faster on CPU.
+    """
+    name = 'quantized'
+
+    def load_model(self):
+        self.device = torch.device('cpu')
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        model.eval()
+        return torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+class OnnxEngine:
+    """
+    ONNX Runtime CPU inference over an exported graph
+    The graph is exported once and reused from onnx_path on later starts.
+    """
+    name = 'onnx'
+
+    def __init__(self, model_name: str, onnx_path: str = None):
+        import onnxruntime as ort  # Optional: only needed for this engine
+
+        self.model_name = model_name
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.onnx_path = onnx_path or os.getenv(
+            'SENTIMENT_ONNX_PATH',
+            os.path.expanduser(f"~/.cache/hssa/{model_name.replace('/', '_')}.onnx")
+        )
+        if not os.path.exists(self.onnx_path):
+            self.export()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(self.onnx_path, options,
+                                            providers=['CPUExecutionProvider'])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def export(self):
+        """Export the eager model to ONNX with dynamic batch/sequence axes"""
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        model.eval()
+        sample = self.tokenizer(["sample text"], return_tensors="pt")
+        names = list(sample.keys())
+        axes = {name: {0: 'batch', 1: 'sequence'} for name in names}
+        axes['logits'] = {0: 'batch'}
+
+        os.makedirs(os.path.dirname(self.onnx_path), exist_ok=True)
+        with torch.inference_mode():
+            torch.onnx.export(
+                model, tuple(sample[n] for n in names), self.onnx_path,
+                input_names=names, output_names=['logits'],
+                dynamic_axes=axes, opset_version=14
+            )
+
+    def predict(self, texts: List[str]) -> torch.Tensor:
+        inputs = self.tokenizer(texts, return_tensors="np", padding=True,
+                                truncation=True, max_length=512)
+        feed = {name: inputs[name].astype(np.int64) for name in self.input_names}
+        logits = self.session.run(['logits'], feed)[0]
+        return torch.nn.functional.softmax(torch.from_numpy(logits), dim=-1)
+
+ENGINES = {
+    TorchEngine.name: TorchEngine,
+    QuantizedTorchEngine.name: QuantizedTorchEngine,
+    OnnxEngine.name: OnnxEngine,
+}
+
+def load_engine(name: str, model_name: str):
+    """Instantiate an inference engine by config name"""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown inference engine '{name}', "
+                         f"expected one of {sorted(ENGINES)}")
+    return ENGINES[name](model_name)
+
+# Engines shared by every analyzer in the process (and, after fork, by workers)
+SHARED_ENGINES = {}
+
+def shared_engine(name: str, model_name: str):
+    """Load an engine on first use and reuse it for the life of the process"""
+    key = (name, model_name)
+    if key not in SHARED_ENGINES:
+        SHARED_ENGINES[key] = load_engine(name, model_name)
+    return SHARED_ENGINES[key]
+
+def preload_engines(specs: List[tuple]):
+    """
+    Load engines in the parent process before forking pool workers
+    Forked workers then share the read-only weight pages copy-on-write
+    instead of each loading its own copy.
+    """
+    # Fast tokenizers deadlock if their thread pool is live across fork
+    os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+
+    for name, model_name in specs:
+        engine = shared_engine(name, model_name)
+        if isinstance(engine, TorchEngine):
+            # Also lets torch.multiprocessing (spawn) pass weights by handle
+            engine.model.share_memory()
+
+    # Keep the collector from touching (and so copying) the loaded objects
+    gc.freeze()
+
+# Fixed corpus for parity checks and benchmarks
+PARITY_CORPUS = [
+    "AAPL beat earnings estimates and raised full-year guidance",
+    "Tesla shares plunged after the recall announcement",
+    "The company reported quarterly results in line with expectations",
+    "Loading up on GME calls before the squeeze, this is going to the moon",
+    "Microsoft cut its revenue outlook citing weaker cloud demand",
+    "Fed holds rates steady, markets flat into the close",
+    "Massive short interest on AMC, shorts are going to get burned",
+    "Layoffs announced as margins collapse for the third straight quarter",
+    "Dividend maintained at $0.24 per share",
+    "Bought more NVDA on the dip, long term bullish",
+    "Guidance cut sends the stock down 20% after hours",
+    "Analysts upgraded the shares to buy with a $250 price target",
+    "SEC opens investigation into accounting irregularities",
+    "Trading volume was average today",
+    "Record free cash flow and a new $10B buyback program",
+    "Puts printing, this market is going to crash hard",
+    "The merger is expected to close in the second half of the year",
+    "Bankruptcy filing wipes out equity holders",
+    "Revenue grew 35% year over year, beating consensus",
+    "Not sure about this one, waiting for more DD before I buy",
+]
+
+def check_parity(reference, candidate, corpus: List[str] = PARITY_CORPUS) -> dict:
+    """Label agreement of a candidate engine against the reference engine"""
+    ref_labels = reference.predict(corpus).argmax(dim=-1)
+    cand_labels = candidate.predict(corpus).argmax(dim=-1)
+    mismatches = [
+        corpus[i] for i in range(len(corpus)) if ref_labels[i] != cand_labels[i]
+    ]
+    return {
+        'engine': candidate.name,
+        'agreement': 1 - len(mismatches) / len(corpus),
+        'mismatches': mismatches
+    }
+
+def compare_engines(model_name: str = "ProsusAI/finbert", names: List[str] = None,
+                    corpus: List[str] = PARITY_CORPUS, batch_size: int = 32,
+                    repeats: int = 5) -> List[dict]:
+    """Load time, single-text latency, batch throughput and parity per engine"""
+    names = names or list(ENGINES)
+    reference = None
+    report = []
+    for name in names:
+        start = time.perf_counter()
+        engine = load_engine(name, model_name)
+        load_seconds = time.perf_counter() - start
+        if name == TorchEngine.name:
+            reference = engine
+
+        # Single-text latency
+        latencies = []
+        for _ in range(repeats):
+            for text in corpus:
+                start = time.perf_counter()
+                engine.predict([text])
+                latencies.append(time.perf_counter() - start)
+
+        # Batch throughput
+        batch = (corpus * (batch_size // len(corpus) + 1))[:batch_size]
+        start = time.perf_counter()
+        for _ in range(repeats):
+            engine.predict(batch)
+        throughput = batch_size * repeats / (time.perf_counter() - start)
+
+        report.append({
+            'engine': name,
+            'load_seconds': round(load_seconds, 2),
+            'p50_ms': round(statistics.median(latencies) * 1000, 2),
+            'p95_ms': round(sorted(latencies)[int(len(latencies) * 0.95)] * 1000, 2),
+            'posts_per_sec': round(throughput, 1),
+            'agreement': (check_parity(reference, engine, corpus)['agreement']
+                          if reference is not None else None)
+        })
+    return report
+
+if __name__ == '__main__':
+    for row in compare_engines():
+        print(row)
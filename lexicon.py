@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+import numpy as np
+import pandas as pd
+
+from aho_corasick import AhoCorasick
+
+# Category -> keywords (substring match on lowercased content)
+DEFAULT_LEXICON = {
+    'fear': ['crash', 'tank', 'dump', 'fear', 'panic', 'sell', 'bearish'],
+    'greed': ['moon', 'rocket', 'bull', 'rally', 'buy', 'lambo', 'breakout'],
+    'put': ['put', 'puts'],
+    'call': ['call', 'calls'],
+}
+
+class LexiconScanner:
+    """
+    Fear/greed/put/call keyword scanner, run once per post at ingest
+    Counts how many distinct keywords of each category a post contains, in
+    one pass, and stores them as small integer columns on sentiment_data
+    (fear_hits, greed_hits, put_hits, call_hits). NULL counts mean the post
+    was never scanned; readers scan those posts' content instead.
+    """
+    def __init__(self, lexicon: dict = None):
+        self.lexicon = lexicon or DEFAULT_LEXICON
+        self.columns = [f'{category}_hits' for category in self.lexicon]
+
+        self.matcher = AhoCorasick()
+        for category, keywords in self.lexicon.items():
+            for keyword in set(keywords):
+                self.matcher.add(keyword, (category, keyword))
+        self.matcher.build()
+
+    def scan(self, content: str) -> dict:
+        """Hit counts for one post: {'fear_hits': int, ...}"""
+        found = {value for _, _, value in self.matcher.find((content or '').lower())}
+        counts = dict.fromkeys(self.columns, 0)
+        for category, _ in found:
+            counts[f'{category}_hits'] += 1
+        return counts
+
+    def scan_frame(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Hit count columns for every row of data['content']"""
+        rows = [self.scan(c if isinstance(c, str) else '') for c in data['content']]
+        return pd.DataFrame(rows, columns=self.columns, index=data.index).astype(np.int16)
+
+    def has_columns(self, data: pd.DataFrame) -> bool:
+        """Whether data already carries ingest-time hit counts"""
+        return all(column in data.columns for column in self.columns)
+
+    def fill_frame(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Hit count columns for data: ingest-time counts where present, content
+        scanned for rows with missing or NULL counts (needs data['content'])
+        """
+        hits = pd.DataFrame({column: data[column] if column in data.columns else np.nan
+                             for column in self.columns}, index=data.index)
+        unscanned = hits.isna().any(axis=1).to_numpy()
+        if unscanned.any():
+            hits.loc[unscanned] = self.scan_frame(data.loc[unscanned])
+        return hits.astype(np.int16)
+
+    def hits(self, post: dict) -> dict:
+        """Hit counts of one post, scanning content if any count is missing/NULL"""
+        counts = {column: post.get(column) for column in self.columns}
+        if any(value is None or value != value for value in counts.values()):  # NULL/NaN
+            return self.scan(post.get('content'))
+        return counts
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+import zlib
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+# Universal hashing modulus: (a * x + b) stays below 2**64 for 32-bit x
+HASH_PRIME = np.uint64((1 << 31) - 1)
+
+class MinHashLSHIndex:
+    """
+    Near-duplicate index over a sliding time window
+    MinHash signatures over character shingles, bucketed by banded LSH.
+    Query, insert and evict cost O(num_perm) per post regardless of window size.
+    """
+    def __init__(self, num_perm: int = 128, bands: int = 16, shingle_size: int = 5,
+                 threshold: float = 0.8, window_seconds: float = 24 * 3600,
+                 max_items: Optional[int] = None, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold  # Estimated Jaccard similarity
+        self.window_seconds = window_seconds
+        self.max_items = max_items
+
+        # Hash family h_i(x) = (a_i * x + b_i) mod p, one per permutation
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, HASH_PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, HASH_PRIME, num_perm, dtype=np.uint64)
+
+        self.buckets = [{} for _ in range(bands)]  # Per band: band key -> doc ids
+        self.signatures = {}  # doc id -> signature
+        self.timeline = deque()  # (timestamp, doc id) in insertion order
+        self.next_id = 0
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text's character shingles"""
+        text = ' '.join(text.lower().split())
+        k = self.shingle_size
+        if len(text) <= k:
+            shingles = {text}
+        else:
+            shingles = {text[i:i + k] for i in range(len(text) - k + 1)}
+
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        # Min over shingles of every permuted hash
+        permuted = (np.outer(hashes, self.a) + self.b) % HASH_PRIME
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def band_keys(self, signature: np.ndarray) -> list:
+        """One bucket key per band"""
+        r = self.rows
+        return [signature[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def query(self, signature: np.ndarray) -> float:
+        """Max estimated Jaccard similarity against indexed posts (0 if none)"""
+        candidates = set()
+        for band, key in zip(self.buckets, self.band_keys(signature)):
+            candidates.update(band.get(key, ()))
+
+        best = 0.0
+        for doc_id in candidates:
+            similarity = float(np.mean(self.signatures[doc_id] == signature))
+            if similarity > best:
+                best = similarity
+        return best
+
+    def insert(self, signature: np.ndarray, timestamp: float) -> int:
+        """Add a post to the index, evicting anything outside the window"""
+        doc_id = self.next_id
+        self.next_id += 1
+
+        self.signatures[doc_id] = signature
+        for band, key in zip(self.buckets, self.band_keys(signature)):
+            band.setdefault(key, set()).add(doc_id)
+        self.timeline.append((timestamp, doc_id))
+
+        self.evict(timestamp)
+        return doc_id
+
+    def evict(self, now: float):
+        """Drop posts older than the window (and beyond max_items)"""
+        cutoff = now - self.window_seconds
+        while self.timeline and (
+            self.timeline[0][0] < cutoff or
+            (self.max_items is not None and len(self.timeline) > self.max_items)
+        ):
+            _, doc_id = self.timeline.popleft()
+            signature = self.signatures.pop(doc_id)
+            for band, key in zip(self.buckets, self.band_keys(signature)):
+                members = band[key]
+                members.discard(doc_id)
+                if not members:
+                    del band[key]
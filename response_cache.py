@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from hashlib import sha1
+from typing import Awaitable, Callable, Optional
+
+import redis.asyncio as aioredis
+
+# Seconds a cached response stays valid, per endpoint
+DEFAULT_TTLS = {
+    'fear_greed_current': 60,
+    'fear_greed_history': 300,
+    'ticker_sentiment': 60,
+    'trending_tickers': 30,
+    'unusual_activity': 15,
+}
+
+class ResponseCache:
+    """
+    Response cache for hot API endpoints
+    Redis-backed (REDIS_URL) with an in-process fallback. Each endpoint has
+    its own TTL; concurrent misses for the same key share one computation.
+    Keys embed a per-namespace generation counter, so writers invalidate
+    everything in a namespace with a single INCR (see invalidate).
+    """
+    def __init__(self, redis_url: Optional[str] = None, ttls: Optional[dict] = None,
+                 key_prefix: str = 'api:', max_entries: int = 10_000):
+        redis_url = redis_url or os.getenv('REDIS_URL')
+        self.redis = aioredis.Redis.from_url(redis_url) if redis_url else None
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.key_prefix = key_prefix
+
+        # In-process fallback: key -> (expires_at, payload), LRU order
+        self.entries = OrderedDict()
+        self.generations = {}
+        self.max_entries = max_entries
+
+        self.inflight = {}  # key -> Future of the computation in progress
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # Misses that waited on another request's query
+
+    async def get_or_compute(self, endpoint: str, params: dict,
+                             compute: Callable[[], Awaitable], namespace: str = None):
+        """
+        Cached response for endpoint(params), or compute() on a miss
+        Responses are stored as JSON, so hits and misses return the same shape.
+        """
+        key = await self.make_key(endpoint, params, namespace or endpoint)
+        payload = await self.get(key)
+        if payload is not None:
+            self.hits += 1
+            return json.loads(payload)
+
+        # Single flight: later misses wait for the first one's result
+        future = self.inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return json.loads(await asyncio.shield(future))
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            payload = json.dumps(await compute(), default=self.encode)
+            await self.set(key, payload, self.ttls.get(endpoint, 30))
+            future.set_result(payload)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved: no warning when nobody waited
+            raise
+        finally:
+            del self.inflight[key]
+        return json.loads(payload)
+
+    async def make_key(self, endpoint: str, params: dict, namespace: str) -> str:
+        generation = await self.generation(namespace)
+        digest = sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{self.key_prefix}{endpoint}:g{generation}:{digest}"
+
+    async def generation(self, namespace: str) -> int:
+        if self.redis is None:
+            return self.generations.get(namespace, 0)
+        value = await self.redis.get(f"{self.key_prefix}gen:{namespace}")
+        return int(value) if value is not None else 0
+
+    async def invalidate(self, namespace: str):
+        """Drop every cached response in a namespace (called by writers)"""
+        if self.redis is None:
+            self.generations[namespace] = self.generations.get(namespace, 0) + 1
+        else:
+            await self.redis.incr(f"{self.key_prefix}gen:{namespace}")
+
+    async def get(self, key: str) -> Optional[str]:
+        if self.redis is not None:
+            return await self.redis.get(key)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < time.time():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return payload
+
+    async def set(self, key: str, payload: str, ttl: int):
+        if self.redis is not None:
+            await self.redis.set(key, payload, ex=ttl)
+            return
+        self.entries[key] = (time.time() + ttl, payload)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def close(self):
+        if self.redis is not None:
+            await self.redis.close()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'backend': 'redis' if self.redis is not None else 'memory',
+        }
+
+    @staticmethod
+    def encode(value):
+        """JSON encoding for asyncpg records, datetimes and numerics"""
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return float(value)
+        if hasattr(value, 'items'):  # asyncpg.Record
+            return dict(value.items())
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
@@ -1,64 +1,171 @@
 #!/usr/bin/env python
 
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from typing import List
+import copy
+import os
+import time
 import torch
 
+from inference_engines import preload_engines, shared_engine
+from sentiment_cache import SentimentCache
+
+FINBERT_MODEL = "ProsusAI/finbert"
+CROSS_VALIDATION_MODEL = "nlptown/bert-base-multilingual-uncased-sentiment"
+
 class FinancialSentimentAnalyzer:
     """
     Multi-model sentiment analysis optimized for financial text
     """
-    def __init__(self):
-        # Primary: FinBERT (specifically trained on financial text)
-        self.finbert_tokenizer = AutoTokenizer.from_pretrained(
-            "ProsusAI/finbert"
-        )
-        self.finbert_model = AutoModelForSequenceClassification.from_pretrained(
-            "ProsusAI/finbert"
-        )
-        
-        # Secondary: General BERT for cross-validation
-        self.bert_tokenizer = AutoTokenizer.from_pretrained(
-            "nlptown/bert-base-multilingual-uncased-sentiment"
-        )
-        self.bert_model = AutoModelForSequenceClassification.from_pretrained(
-            "nlptown/bert-base-multilingual-uncased-sentiment"
-        )
-        
+    def __init__(self, batch_size: int = 32, cache: SentimentCache = None,
+                 engine: str = None, cross_validate: bool = None):
+        # Models are loaded on first use, see the finbert/bert properties
+        # Backend: 'torch' (eager), 'quantized' (int8) or 'onnx' (ONNX Runtime)
+        self.engine = engine or os.getenv('SENTIMENT_ENGINE', 'torch')
+
+        # Secondary model is only loaded when cross-validation is enabled
+        if cross_validate is None:
+            cross_validate = os.getenv('SENTIMENT_CROSS_VALIDATE', '0') == '1'
+        self.cross_validate = cross_validate
+
+        # Part of the cache key: bump when the model or its weights change
+        self.model_version = f"{FINBERT_MODEL}:{self.engine}"
+        if cross_validate:
+            self.model_version += f"+{CROSS_VALIDATION_MODEL}"
+
+        # Micro-batch size for batch_analyze
+        self.batch_size = batch_size
+        # Throughput of the last batch_analyze call (for replica sizing)
+        self.last_batch_stats = {'posts': 0, 'seconds': 0.0, 'posts_per_sec': 0.0}
+
+        # Optional result cache (cross-posts, forwards, bot reposts)
+        self.cache = cache
+
+    @property
+    def finbert(self):
+        """Primary: FinBERT (specifically trained on financial text)"""
+        return shared_engine(self.engine, FINBERT_MODEL)
+
+    @property
+    def bert(self):
+        """Secondary: General BERT (1-5 stars) for cross-validation"""
+        return shared_engine('torch', CROSS_VALIDATION_MODEL)
+
+    def preload(self):
+        """
+        Load this analyzer's models up front, e.g. in the parent process
+        before forking a worker pool so workers share the weights
+        """
+        specs = [(self.engine, FINBERT_MODEL)]
+        if self.cross_validate:
+            specs.append(('torch', CROSS_VALIDATION_MODEL))
+        preload_engines(specs)
+
     def analyze_sentiment(self, text: str) -> dict:
         """
         Returns sentiment scores
-        Output: {'label': 'positive'|'negative'|'neutral', 
+        Output: {'label': 'positive'|'negative'|'neutral',
                  'score': float, 'confidence': float}
         """
+        if self.cache is not None:
+            cached = self.cache.get(text, self.model_version)
+            if cached is not None:
+                return cached
+
         # FinBERT analysis
-        inputs = self.finbert_tokenizer(text, return_tensors="pt", 
-                                       truncation=True, max_length=512)
-        outputs = self.finbert_model(**inputs)
-        probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-        
+        start = time.perf_counter()
+        result = self.run_batches([text], 1)[0]
+
+        if self.cache is not None:
+            self.cache.record_model_time(time.perf_counter() - start, 1)
+            self.cache.put(text, self.model_version, result)
+        return result
+
+    def format_result(self, probs: torch.Tensor) -> dict:
+        """Build the result dict from one row of class probabilities"""
         # Labels: [negative, neutral, positive]
         sentiment_idx = torch.argmax(probs).item()
         sentiment_labels = ['negative', 'neutral', 'positive']
-        
+
         return {
             'label': sentiment_labels[sentiment_idx],
             'score': self.map_to_score(sentiment_idx),  # -1 to +1
-            'confidence': probs[0][sentiment_idx].item(),
-            'raw_probs': probs[0].tolist()
+            'confidence': probs[sentiment_idx].item(),
+            'raw_probs': probs.tolist()
         }
-    
+
     def map_to_score(self, label_idx: int) -> float:
         """Map categorical sentiment to continuous score"""
         mapping = {0: -1.0, 1: 0.0, 2: 1.0}
         return mapping[label_idx]
-    
-    def batch_analyze(self, texts: List[str]) -> List[dict]:
-        """Efficient batch processing"""
-        # Use GPU if available
-        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        self.finbert_model.to(device)
-        
-        results = []
-        for text in texts:
-            results.append(self.analyze_sentiment(text))
+
+    def cross_validation_result(self, probs: torch.Tensor, result: dict) -> dict:
+        """Expected star rating (1-5 → -1 to +1) and agreement with FinBERT"""
+        star_scores = torch.tensor([-1.0, -0.5, 0.0, 0.5, 1.0])
+        score = float((probs * star_scores).sum())
+        agrees = (score > 0.25 and result['score'] > 0) or \
+                 (score < -0.25 and result['score'] < 0) or \
+                 (abs(score) <= 0.25 and result['score'] == 0)
+        return {'score': round(score, 3), 'agrees': agrees}
+
+    def batch_analyze(self, texts: List[str], batch_size: int = None) -> List[dict]:
+        """
+        Efficient batch processing
+        Texts are sorted by length and run in padded micro-batches so each
+        batch pads to a similar length. Results come back in input order.
+        """
+        batch_size = batch_size or self.batch_size
+        start = time.perf_counter()
+
+        if self.cache is None:
+            results = self.run_batches(texts, batch_size)
+        else:
+            # Only run the model on cache misses, once per distinct text
+            results = self.cache.get_many(texts, self.model_version)
+            pending = {}
+            for i, result in enumerate(results):
+                if result is None:
+                    key = self.cache.make_key(texts[i], self.model_version)
+                    pending.setdefault(key, []).append(i)
+
+            if pending:
+                miss_texts = [texts[idx[0]] for idx in pending.values()]
+                model_start = time.perf_counter()
+                miss_results = self.run_batches(miss_texts, batch_size)
+                self.cache.record_model_time(time.perf_counter() - model_start,
+                                             len(miss_texts))
+                self.cache.put_many(miss_texts, self.model_version, miss_results)
+
+                # Repeated texts get their own copy of the shared result
+                for idx, result in zip(pending.values(), miss_results):
+                    results[idx[0]] = result
+                    for i in idx[1:]:
+                        results[i] = copy.deepcopy(result)
+
+        elapsed = time.perf_counter() - start
+        self.last_batch_stats = {
+            'posts': len(texts),
+            'seconds': round(elapsed, 3),
+            'posts_per_sec': round(len(texts) / elapsed, 1) if elapsed > 0 else 0.0
+        }
+        return results
+
+    def run_batches(self, texts: List[str], batch_size: int) -> List[dict]:
+        """Run FinBERT over texts in length-bucketed padded micro-batches"""
+        # Length buckets: neighbouring texts have similar token counts
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+
+        results = [None] * len(texts)
+        for offset in range(0, len(order), batch_size):
+            batch_idx = order[offset:offset + batch_size]
+            probs = self.finbert.predict([texts[i] for i in batch_idx])
+
+            for row, i in enumerate(batch_idx):
+                results[i] = self.format_result(probs[row])
+
+            if self.cross_validate:
+                bert_probs = self.bert.predict([texts[i] for i in batch_idx])
+                for row, i in enumerate(batch_idx):
+                    results[i]['cross_validation'] = self.cross_validation_result(
+                        bert_probs[row], results[i]
+                    )
         return results
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+import json
+import time
+import unicodedata
+from collections import OrderedDict
+from hashlib import sha1
+from typing import List, Optional
+
+import redis
+
+class SentimentCache:
+    """
+    Content-addressed cache for sentiment results
+    Keyed by hash(model version + normalized text), bounded by LRU size and TTL.
+    Optionally backed by Redis so all processor replicas share results.
+    """
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: int = 24 * 3600,
+                 redis_url: Optional[str] = None, key_prefix: str = 'sentiment:'):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.entries = OrderedDict()  # key -> (expires_at, JSON payload), LRU order
+
+        # Shared store (e.g. REDIS_URL of the sentiment_processor service)
+        self.redis = redis.Redis.from_url(redis_url) if redis_url else None
+
+        # Counters
+        self.hits = 0
+        self.shared_hits = 0  # Subset of hits served by the shared store
+        self.misses = 0
+        self.model_seconds = 0.0  # Model time spent on misses
+        self.model_texts = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Canonical form used for keying (unicode + whitespace folding)"""
+        return ' '.join(unicodedata.normalize('NFKC', text).split())
+
+    def make_key(self, text: str, model_version: str) -> str:
+        """Content address for a text under a given model version"""
+        digest = sha1(f"{model_version}\x00{self.normalize(text)}".encode()).hexdigest()
+        return self.key_prefix + digest
+
+    def get(self, text: str, model_version: str) -> Optional[dict]:
+        """Cached result for text, or None"""
+        return self.get_many([text], model_version)[0]
+
+    def get_many(self, texts: List[str], model_version: str) -> List[Optional[dict]]:
+        """Cached results for texts (None for misses), one round trip to Redis"""
+        now = time.time()
+        keys = [self.make_key(t, model_version) for t in texts]
+        results = [self.get_local(key, now) for key in keys]
+
+        # Fall through to the shared store for local misses
+        missing = [i for i, r in enumerate(results) if r is None]
+        if self.redis is not None and missing:
+            values = self.redis.mget([keys[i] for i in missing])
+            for i, value in zip(missing, values):
+                if value is not None:
+                    results[i] = json.loads(value)
+                    self.put_local(keys[i], value, now)
+                    self.shared_hits += 1
+
+        found = sum(r is not None for r in results)
+        self.hits += found
+        self.misses += len(results) - found
+        return results
+
+    def put(self, text: str, model_version: str, result: dict):
+        """Store a single result"""
+        self.put_many([text], model_version, [result])
+
+    def put_many(self, texts: List[str], model_version: str, results: List[dict]):
+        """Store results locally and in the shared store"""
+        now = time.time()
+        keys = [self.make_key(t, model_version) for t in texts]
+        payloads = [json.dumps(result) for result in results]
+        for key, payload in zip(keys, payloads):
+            self.put_local(key, payload, now)
+
+        if self.redis is not None and keys:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, payload in zip(keys, payloads):
+                pipe.setex(key, self.ttl_seconds, payload)
+            pipe.execute()
+
+    def get_local(self, key: str, now: float) -> Optional[dict]:
+        """LRU lookup, dropping expired entries"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < now:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        # Decode per lookup so callers never share (or mutate) a cached object
+        return json.loads(payload)
+
+    def put_local(self, key: str, payload, now: float):
+        """LRU insert of a JSON payload, evicting the least recently used entries"""
+        self.entries[key] = (now + self.ttl_seconds, payload)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def record_model_time(self, seconds: float, n_texts: int):
+        """Account model time spent on cache misses"""
+        self.model_seconds += seconds
+        self.model_texts += n_texts
+
+    def stats(self) -> dict:
+        """Hit/miss counters and estimated model time saved"""
+        lookups = self.hits + self.misses
+        per_text = self.model_seconds / self.model_texts if self.model_texts else 0.0
+        return {
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': len(self.entries),
+            'model_seconds': round(self.model_seconds, 3),
+            'model_seconds_saved': round(self.hits * per_text, 3)
+        }
@@ -1,63 +1,136 @@
 #!/usr/bin/env python
 import re
-from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from velocity_tracker import PostingVelocityTracker
 
 class SpamBotFilter:
     """
     Filters out spam, bots, and low-quality content
     """
-    def __init__(self):
-        self.spam_patterns = [
-            r'(click here|buy now|limited time)',
-            r'(🚀){3,}',  # Excessive rocket emojis
-            r'(!!!){2,}',  # Excessive punctuation
-            r'(dm me|contact me|join my)',  # Solicitation
-        ]
+    def __init__(self, velocity_thresholds: Optional[dict] = None):
+        # Rule name -> content pattern
+        self.spam_patterns = {
+            'promotion': r'(?:click here|buy now|limited time)',
+            'rocket_spam': r'(?:🚀){3,}',  # Excessive rocket emojis
+            'punctuation': r'(?:!!!){2,}',  # Excessive punctuation
+            'solicitation': r'(?:dm me|contact me|join my)',  # Solicitation
+        }
+        # All content rules compiled into one pass; the named group is the rule
+        self.spam_regex = re.compile(
+            '|'.join(f'(?P<{name}>{p})' for name, p in self.spam_patterns.items()),
+            re.IGNORECASE
+        )
+        financial_terms = ['stock', 'ticker', 'calls', 'puts', 'buy',
+                           'sell', 'dd', 'analysis', 'target', 'price']
+        self.financial_regex = re.compile('|'.join(financial_terms), re.IGNORECASE)
+
         self.known_bots = set()  # Load from database
-        self.user_post_history = {}  # Track posting patterns
-        
+        # Track posting patterns: max posts/hour per platform (default 50)
+        self.velocity_tracker = PostingVelocityTracker(thresholds=velocity_thresholds)
+
     def is_spam(self, content: str, metadata: dict) -> bool:
         """Determine if content is spam"""
+        return self.spam_rule(content, metadata) is not None
+
+    def spam_rule(self, content: str, metadata: dict) -> Optional[str]:
+        """Name of the first rule that flags the post, or None"""
         # Check content patterns
-        for pattern in self.spam_patterns:
-            if re.search(pattern, content.lower()):
-                return True
-        
+        match = self.spam_regex.search(content)
+        if match:
+            return match.lastgroup
+
         # Check for known bot accounts
         if metadata.get('author') in self.known_bots:
-            return True
-        
+            return 'known_bot'
+
         # Check posting velocity (bot detection)
         author = metadata.get('author')
-        if self.is_posting_too_fast(author):
-            return True
-        
+        if self.is_posting_too_fast(author, metadata.get('platform'),
+                                    metadata.get('timestamp')):
+            return 'velocity'
+
         # Check content quality (very short, no tickers mentioned, etc.)
         if len(content) < 20 and not self.contains_financial_terms(content):
-            return True
-        
-        return False
-    
-    def is_posting_too_fast(self, author: str) -> bool:
+            return 'low_quality'
+
+        return None
+
+    def is_spam_batch(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized spam filtering for backfills
+        Input: DataFrame with columns [content, author] and optionally
+        [timestamp, platform] (posting velocity is measured on the batch's
+        own timestamps)
+        Returns: DataFrame [is_spam, rule] aligned with data.index
+        """
+        content = data['content'].fillna('').astype(str)
+
+        # Content rules: one combined regex per post
+        search = self.spam_regex.search
+        content_rule = np.array(
+            [m.lastgroup if m else None for m in map(search, content.tolist())],
+            dtype=object
+        )
+
+        known_bot = data['author'].isin(self.known_bots).to_numpy()
+
+        if 'timestamp' in data.columns:
+            too_fast = self.batch_velocity(data['author'], data['timestamp'],
+                                           data.get('platform'))
+        else:
+            too_fast = np.zeros(len(data), dtype=bool)
+
+        low_quality = (
+            (content.str.len() < 20) & ~content.str.contains(self.financial_regex)
+        ).to_numpy()
+
+        # Same precedence as spam_rule
+        rule = np.select(
+            [pd.notna(content_rule), known_bot, too_fast, low_quality],
+            [content_rule, 'known_bot', 'velocity', 'low_quality'],
+            default=None
+        )
+        return pd.DataFrame({'is_spam': pd.notna(rule), 'rule': rule},
+                            index=data.index)
+
+    def batch_velocity(self, authors: pd.Series, timestamps: pd.Series,
+                       platforms: pd.Series = None) -> np.ndarray:
+        """Flag posts whose author went over the platform threshold in the prior window"""
+        if len(timestamps) == 0:
+            return np.zeros(0, dtype=bool)
+        tracker = self.velocity_tracker
+        window = float(tracker.window_seconds)
+        epoch = pd.Timestamp(0, tz='UTC')
+        seconds = (pd.to_datetime(timestamps, utc=True) - epoch).dt.total_seconds().to_numpy()
+
+        if platforms is None:
+            codes = pd.factorize(authors)[0]
+            limits = np.full(len(authors), tracker.default_threshold)
+        else:
+            codes = pd.factorize(pd.MultiIndex.from_arrays([platforms, authors]))[0]
+            limits = platforms.map(tracker.thresholds).fillna(
+                tracker.default_threshold).to_numpy()
+
+        # Sort by (author, time) and separate authors by more than the window,
+        # so one searchsorted finds each post's window start within its author
+        order = np.lexsort((seconds, codes))
+        t = seconds[order] - seconds.min()
+        key = codes[order] * (t.max() + 2 * window) + t
+        window_start = np.searchsorted(key, key - window, side='right')
+
+        counts = np.empty(len(key), dtype=np.int64)
+        counts[order] = np.arange(len(key)) - window_start + 1
+        return counts > limits
+
+    def is_posting_too_fast(self, author: str, platform: str = None,
+                            timestamp=None) -> bool:
         """Detect bot-like posting patterns"""
-        if author not in self.user_post_history:
-            self.user_post_history[author] = []
-        
-        now = datetime.now()
-        self.user_post_history[author].append(now)
-        
-        # Remove posts older than 1 hour
-        self.user_post_history[author] = [
-            ts for ts in self.user_post_history[author]
-            if ts > now - timedelta(hours=1)
-        ]
-        
-        # Flag if >50 posts per hour
-        return len(self.user_post_history[author]) > 50
-    
+        return self.velocity_tracker.is_too_fast(author, platform, timestamp)
+
     def contains_financial_terms(self, text: str) -> bool:
         """Check if text contains financial terminology"""
-        financial_terms = ['stock', 'ticker', 'calls', 'puts', 'buy', 
-                          'sell', 'dd', 'analysis', 'target', 'price']
-        text_lower = text.lower()
-        return any(term in text_lower for term in financial_terms)
+        return self.financial_regex.search(text) is not None
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import rank_ic, rank_rows
+
+def spearman(x: np.ndarray, y: np.ndarray) -> float:
+    """Average-rank Spearman on the pairs where both sides are present"""
+    pairs = pd.DataFrame({'x': x, 'y': y}).dropna()
+    if len(pairs) < 3 or pairs['x'].nunique() < 2 or pairs['y'].nunique() < 2:
+        return np.nan
+    return pairs['x'].rank().corr(pairs['y'].rank())
+
+def test_rank_rows_averages_ties():
+    values = np.array([[3.0, 1.0, 3.0, np.nan, 2.0, 3.0]])
+    expected = pd.Series(values[0]).rank().to_numpy() - 1
+    np.testing.assert_array_equal(rank_rows(values)[0], expected)
+
+def test_constant_signal_has_no_ic():
+    signal = np.zeros((1, 5))
+    returns = np.array([[0.01, 0.02, 0.03, 0.04, 0.05]])
+    assert np.isnan(rank_ic(signal, returns)[0])
+
+def test_partial_ties():
+    signal = np.array([[1.0, 1.0, 0.0, 0.0, -1.0]])
+    returns = np.array([[-0.02, -0.01, 0.0, 0.01, 0.02]])
+    assert rank_ic(signal, returns)[0] == pytest.approx(spearman(signal[0], returns[0]))
+
+def test_rank_ic_matches_spearman():
+    rng = np.random.default_rng(0)
+    # Discrete, forward-filled-looking signals: many ties, some gaps
+    signal = rng.integers(-2, 3, size=(200, 12)).astype(float)
+    returns = rng.normal(size=(200, 12)).round(2)
+    signal[rng.random(signal.shape) < 0.1] = np.nan
+    returns[rng.random(returns.shape) < 0.1] = np.nan
+
+    ic = rank_ic(signal, returns)
+    expected = np.array([spearman(signal[t], returns[t]) for t in range(len(signal))])
+    np.testing.assert_allclose(ic, expected, equal_nan=True)
+
+def test_single_column_is_time_series_ic():
+    rng = np.random.default_rng(1)
+    signal = rng.integers(0, 4, size=(50, 1)).astype(float)
+    returns = rng.normal(size=(50, 1))
+    assert rank_ic(signal, returns)[0] == pytest.approx(spearman(signal[:, 0], returns[:, 0]))
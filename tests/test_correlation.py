@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlation import RollingLagStats
+
+def rolling_corr(data: np.ndarray, i: int, j: int, window: int, lag: int) -> float:
+    """pandas reference: corr of x_i[t] with x_j[t - lag] over the last window pairs"""
+    now = pd.Series(data[:, i])
+    lagged = pd.Series(data[:, j]).shift(lag)
+    return now.rolling(window, min_periods=2).corr(lagged).iloc[-1]
+
+@pytest.mark.parametrize('steps', [3, 10, 30, 100])
+@pytest.mark.parametrize('lag', [0, 1, 2, 6])
+def test_matches_pandas_rolling_corr(steps, lag):
+    rng = np.random.default_rng(steps * 10 + lag)
+    window, width = 24, 3
+    data = rng.normal(size=(steps, width)).cumsum(axis=0)
+    stats = RollingLagStats(1, width, windows=(window,), max_lag=6)
+    for row in data:
+        stats.push(row[None, :])
+
+    corr = stats.correlation(window, lag)[0]
+    for i in range(width):
+        for j in range(width):
+            expected = rolling_corr(data, i, j, window, lag)
+            if np.isnan(expected):
+                assert np.isnan(corr[i, j])
+            else:
+                assert corr[i, j] == pytest.approx(expected, abs=1e-9)
+
+def test_new_series_are_backfilled():
+    """Series first seen mid-stream correlate as if flat before, not zero"""
+    from datetime import datetime, timedelta
+    from correlation import CorrelationEngine
+
+    rng = np.random.default_rng(7)
+    steps, window = 60, 24
+    start = datetime(2026, 1, 1)
+    engine = CorrelationEngine(windows=(window,), max_lag=2)
+    history = {'AAPL': [], 'TSLA': []}
+    for t in range(steps):
+        rows = [{'ticker': 'SPY', 'platform': 'reddit', 'avg_sentiment': rng.normal(),
+                 'mention_count': 1}]
+        if t >= 45:  # Both first seen late, independent values
+            for ticker in history:
+                value = rng.normal() * 0.1 + 0.5
+                history[ticker].append(value)
+                rows.append({'ticker': ticker, 'platform': 'reddit',
+                             'avg_sentiment': value, 'mention_count': 1})
+        engine.ingest_bucket(start + timedelta(hours=t), rows)
+
+    first = {ticker: values[0] for ticker, values in history.items()}
+    data = np.array([[first[t]] * 45 + history[t] for t in history]).T
+    expected = rolling_corr(data, 0, 1, window, 0)
+    corr = engine.ticker_correlation(window, 0).loc['AAPL', 'TSLA']
+    assert corr == pytest.approx(expected, abs=1e-9)
@@ -0,0 +1,68 @@
+import csv
+import random
+
+import pytest
+
+from aho_corasick import AhoCorasick, CompiledAhoCorasick
+from entity_extraction import TickerExtractor
+from ticker_universe import build_universe
+
+def naive_find(patterns: dict, text: str) -> list:
+    """Every (start, end, value) by direct substring comparison"""
+    return sorted(
+        (start, start + len(pattern), value)
+        for pattern, value in patterns.items()
+        for start in range(len(text) - len(pattern) + 1)
+        if text.startswith(pattern, start)
+    )
+
+@pytest.mark.parametrize('dense_depth', [0, 1, 2, 4, 10])
+def test_compiled_matcher_matches_naive_search(dense_depth):
+    rng = random.Random(dense_depth)
+    for _ in range(100):
+        patterns = {''.join(rng.choice('abc ') for _ in range(rng.randint(1, 6))): i
+                    for i in range(rng.randint(0, 30))}
+        matcher = AhoCorasick()
+        for pattern, value in patterns.items():
+            matcher.add(pattern, value)
+        matcher.build()
+        compiled = CompiledAhoCorasick(**matcher.compile(dense_depth))
+        for _ in range(5):
+            text = ''.join(rng.choice('abcd ') for _ in range(60))
+            expected = naive_find(patterns, text)
+            assert sorted(matcher.find(text)) == expected
+            assert sorted(compiled.find(text)) == expected
+
+@pytest.fixture
+def universe_path(tmp_path):
+    listings = tmp_path / 'listings.csv'
+    with open(listings, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['symbol', 'name', 'aliases'])
+        writer.writerow(['AAPL', 'Apple Computer', 'apple'])
+        writer.writerow(['TSLA', 'Tesla Inc', 'tesla'])
+        writer.writerow(['BAC', 'Bank of America', ''])
+    path = str(tmp_path / 'universe.bin')
+    build_universe(str(listings), path)
+    return path
+
+@pytest.mark.parametrize('use_universe', [False, True])
+def test_overlapping_aliases_count_once(use_universe, request):
+    extractor = TickerExtractor(
+        universe_path=request.getfixturevalue('universe_path') if use_universe else None)
+    if not use_universe:
+        extractor.company_to_ticker['apple computer'] = 'AAPL'
+        extractor.matcher = extractor.build_matcher()
+
+    texts = ['Apple Computer beat estimates, $AAPL up', 'tesla and apple']
+    mentions = extractor.extract_tickers_batch(texts)
+    rows = list(zip(mentions['post_index'], mentions['ticker'], mentions['offset']))
+    assert len(rows) == len(set(rows))
+    assert rows.count((0, 'AAPL', 0)) == 1
+    assert (1, 'TSLA', 0) in rows and (1, 'AAPL', 10) in rows
+
+def test_universe_matches_literal_extractor(universe_path):
+    literal = TickerExtractor()
+    mapped = TickerExtractor(universe_path=universe_path)
+    text = 'Loading calls on $TSLA, tesla to the moon; long AAPL stock'
+    assert mapped.find_tickers(text) == literal.find_tickers(text)
@@ -0,0 +1,76 @@
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indices import FearGreedIndex, StreamingFearGreedIndex
+
+def make_posts(now: datetime, n: int = 2000, seed: int = 0) -> pd.DataFrame:
+    """Posts over the last week, none within a minute of a window edge"""
+    rng = np.random.default_rng(seed)
+    minutes = rng.integers(0, 7 * 24 * 60 - 2, size=n)
+    # Keep clear of the 1h/2h boundaries the windows cut at
+    minutes = minutes[(minutes % 60 != 0) & (minutes % 60 != 59)]
+    ages = pd.to_timedelta(minutes, unit='m') + pd.Timedelta(seconds=30)
+    return pd.DataFrame({
+        'timestamp': pd.Timestamp(now) - ages,
+        'sentiment_score': rng.uniform(-1, 1, size=len(minutes)).round(3),
+        'fear_hits': rng.integers(0, 3, size=len(minutes)),
+        'greed_hits': rng.integers(0, 3, size=len(minutes)),
+        'put_hits': rng.integers(0, 2, size=len(minutes)),
+        'call_hits': rng.integers(0, 2, size=len(minutes)),
+    }).sort_values('timestamp', ignore_index=True)
+
+def with_null_score(data: pd.DataFrame, now: datetime) -> pd.DataFrame:
+    """Set one score in the last hour and one in the previous hour to NULL"""
+    data = data.copy()
+    age = pd.Timestamp(now) - data['timestamp']
+    data.loc[age[age < timedelta(hours=1)].index[0], 'sentiment_score'] = None
+    data.loc[age[(age > timedelta(hours=1)) & (age < timedelta(hours=2))].index[0],
+             'sentiment_score'] = None
+    return data
+
+@pytest.mark.parametrize('null_score', [False, True])
+def test_calculate_range_matches_calculate(null_score):
+    now = datetime.now().replace(microsecond=0)
+    data = make_posts(now)
+    if null_score:
+        data = with_null_score(data, now)
+    index = FearGreedIndex()
+
+    expected = index.calculate(data)
+    result = index.calculate_range(data, now, now)
+    assert result['index_value'].iloc[0] == pytest.approx(expected, abs=0.01)
+
+def test_null_score_does_not_poison_later_steps():
+    now = datetime.now().replace(second=0, microsecond=0)
+    data = with_null_score(make_posts(now), now)
+    result = FearGreedIndex().calculate_range(data, now - timedelta(hours=3), now,
+                                              step='5min')
+    assert np.isfinite(result.drop(columns='interpretation').to_numpy(dtype=float)).all()
+
+def test_streaming_emit_matches_calculate_range():
+    now = datetime.now().replace(second=0, microsecond=0)
+    data = with_null_score(make_posts(now), now)
+    stream = StreamingFearGreedIndex(bucket_seconds=60)
+    for post in data.to_dict('records'):
+        post['sentiment_score'] = (None if pd.isna(post['sentiment_score'])
+                                   else post['sentiment_score'])
+        stream.update(post)
+
+    emitted = stream.emit(now)
+    expected = FearGreedIndex().calculate_range(data, now, now).iloc[0]
+    assert emitted['index_value'] == pytest.approx(expected['index_value'], abs=0.01)
+    for name, value in emitted['components'].items():
+        assert value == pytest.approx(expected[name], abs=1e-6)
+    json.dumps(emitted, allow_nan=False)
+
+def test_empty_window_is_neutral():
+    now = datetime.now().replace(second=0, microsecond=0)
+    data = make_posts(now)
+    data = data[pd.Timestamp(now) - data['timestamp'] > timedelta(hours=3)]
+    result = FearGreedIndex().calculate_range(data, now, now).iloc[0]
+    assert result['index_value'] == 50.0
+    assert result['sentiment_score'] == 50.0
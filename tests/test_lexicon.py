@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from indices import FearGreedIndex
+from lexicon import LexiconScanner
+
+def test_fill_frame_scans_only_null_rows():
+    scanner = LexiconScanner()
+    data = pd.DataFrame({
+        'content': ['market crash, buying puts', 'to the moon, calls', 'crash crash'],
+        'fear_hits': [5, None, None],
+        'greed_hits': [0, None, 1],
+        'put_hits': [0, None, 0],
+        'call_hits': [0, None, 0],
+    })
+    hits = scanner.fill_frame(data)
+    # Row 0 keeps its stored counts, rows 1 and 2 are scanned
+    assert hits.iloc[0].tolist() == [5, 0, 0, 0]
+    assert hits.iloc[1].to_dict() == scanner.scan(data['content'][1])
+    assert hits.iloc[2].to_dict() == scanner.scan(data['content'][2])
+    assert (hits.dtypes == np.int16).all()
+
+def test_keyword_counts_scan_null_hits():
+    index = FearGreedIndex()
+    post = {'content': 'panic selling, loading puts', 'fear_hits': None,
+            'greed_hits': None, 'put_hits': None, 'call_hits': None}
+    assert index.keyword_counts(post) == index.keyword_counts({'content': post['content']})
+    assert index.keyword_counts(post)[0] == 1
@@ -0,0 +1,26 @@
+from sentiment_cache import SentimentCache
+
+RESULT = {'label': 'positive', 'score': 1.0, 'confidence': 0.9,
+          'raw_probs': [0.05, 0.05, 0.9]}
+
+def test_mutating_result_does_not_corrupt_cache():
+    cache = SentimentCache()
+    result = {**RESULT, 'raw_probs': list(RESULT['raw_probs'])}
+    cache.put('calls on TSLA', 'v1', result)
+    result['score'] = -1.0
+    result['raw_probs'][2] = 0.0
+
+    cached = cache.get('calls on TSLA', 'v1')
+    assert cached == RESULT
+    cached['label'] = 'negative'
+    cached['raw_probs'].clear()
+    assert cache.get('calls on TSLA', 'v1') == RESULT
+
+def test_identical_texts_get_distinct_objects():
+    cache = SentimentCache()
+    cache.put('calls on TSLA', 'v1', RESULT)
+    first, second = cache.get_many(['calls on TSLA', 'calls  on TSLA'], 'v1')
+    assert first == second == RESULT
+    assert first is not second
+    assert first['raw_probs'] is not second['raw_probs']
+    assert cache.stats()['hits'] == 2
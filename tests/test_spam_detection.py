@@ -0,0 +1,56 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from spam_detection import SpamBotFilter
+from velocity_tracker import PostingVelocityTracker
+
+SNIPPETS = ['click here', 'BUY NOW', '🚀🚀🚀', '🚀🚀', '!!!!!!', '!!!', 'dm me',
+            'Join My', 'calls', 'TSLA', 'to the moon', 'price target', 'lol', '']
+
+def scalar_rules(spam_filter: SpamBotFilter, data: pd.DataFrame) -> list:
+    """spam_rule applied post by post, in row order"""
+    return [spam_filter.spam_rule(row['content'] if isinstance(row['content'], str) else '', row)
+            for row in data.to_dict('records')]
+
+def batch_rules(spam_filter: SpamBotFilter, data: pd.DataFrame) -> list:
+    """is_spam_batch rule column, with missing rules as None"""
+    rule = spam_filter.is_spam_batch(data)['rule']
+    return [r if isinstance(r, str) else None for r in rule]
+
+def test_batch_matches_spam_rule():
+    rng = random.Random(0)
+    data = pd.DataFrame({
+        'content': [' '.join(rng.choices(SNIPPETS, k=rng.randint(0, 5)))
+                    for _ in range(2000)],
+        'author': [f'user{rng.randint(0, 30)}' for _ in range(2000)],
+    })
+    data.loc[::97, 'content'] = None
+    scalar, batch = SpamBotFilter(), SpamBotFilter()
+    scalar.known_bots = batch.known_bots = {'user3', 'user7'}
+
+    expected = scalar_rules(scalar, data)
+    assert batch_rules(batch, data) == expected
+    assert batch.is_spam_batch(data)['is_spam'].tolist() == [r is not None for r in expected]
+
+def test_batch_velocity_matches_tracker():
+    rng = random.Random(1)
+    start = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    seconds = sorted(rng.randint(0, 3 * 3600) for _ in range(3000))
+    data = pd.DataFrame({
+        'content': 'Loading calls before earnings, price target raised',
+        'author': [f'user{rng.randint(0, 5)}' for _ in seconds],
+        'platform': rng.choices(['reddit', 'twitter'], k=len(seconds)),
+        'timestamp': [start + timedelta(seconds=s) for s in seconds],
+    })
+    thresholds = {'reddit': 40, 'twitter': 80}
+    batch = SpamBotFilter(velocity_thresholds=thresholds)
+    scalar = SpamBotFilter()
+    # One-second buckets on whole-second timestamps: an exact sliding window
+    scalar.velocity_tracker = PostingVelocityTracker(n_buckets=3600,
+                                                     thresholds=thresholds)
+
+    expected = scalar_rules(scalar, data)
+    assert 'velocity' in expected
+    assert batch_rules(batch, data) == expected
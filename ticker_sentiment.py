@@ -1,7 +1,14 @@
 #!/usr/bin/env python
 
+import re
+import numpy as np
 import pandas as pd
 from collections import defaultdict
+from datetime import datetime, timedelta
+
+from hot_store import SentimentRingStore
+
+TICKER_PATTERN = re.compile(r'[A-Z][A-Z0-9.\-]*')
 
 class TickerSentimentAggregator:
     """
@@ -26,8 +33,12 @@ class TickerSentimentAggregator:
             'platform_breakdown': dict,
             'unusual_activity': bool
         }
+        data: DataFrame or SentimentRingStore
         """
-        ticker_data = data[data['tickers'].str.contains(ticker, na=False)]
+        if isinstance(data, SentimentRingStore):
+            # Only this ticker's rows are copied out of the store
+            data = data.frame(since=datetime.now() - timedelta(days=7), ticker=ticker)
+        ticker_data = data[self.ticker_mask(data, ticker)]
         
         if len(ticker_data) == 0:
             return None
@@ -71,7 +82,7 @@ class TickerSentimentAggregator:
     def calculate_ticker_momentum(self, ticker: str, data: pd.DataFrame) -> float:
         """Calculate sentiment momentum for ticker"""
         now = datetime.now()
-        ticker_data = data[data['tickers'].str.contains(ticker, na=False)]
+        ticker_data = data[self.ticker_mask(data, ticker)]
         
         # Last 4 hours split into 4 buckets
         buckets = []
@@ -119,3 +130,83 @@ class TickerSentimentAggregator:
         sentiment_divergence = abs(current_sentiment - avg_sentiment) > 0.5
         
         return volume_spike or sentiment_divergence
+
+    def ticker_lists(self, tickers: pd.Series) -> pd.Series:
+        """Normalize the tickers column to lists (TEXT[] or '{AAPL,TSLA}' strings)"""
+        return tickers.map(
+            lambda t: t if isinstance(t, (list, tuple, np.ndarray))
+            else TICKER_PATTERN.findall(t) if isinstance(t, str)
+            else []
+        )
+
+    def ticker_mask(self, data: pd.DataFrame, ticker: str) -> pd.Series:
+        """Rows that mention exactly this ticker (so 'AM' does not match 'AMC')"""
+        return self.ticker_lists(data['tickers']).map(lambda ts: ticker in ts).astype(bool)
+
+    def explode_tickers(self, data: pd.DataFrame) -> pd.DataFrame:
+        """One row per (post, ticker) with a 'ticker' column"""
+        exploded = data[['timestamp', 'platform', 'sentiment_score']].assign(
+            ticker=self.ticker_lists(data['tickers'])
+        ).explode('ticker', ignore_index=True)
+        return exploded[exploded['ticker'].notna()]
+
+    def aggregate_all(self, data: pd.DataFrame, now: datetime = None) -> pd.DataFrame:
+        """
+        Sentiment for every ticker in one grouped pass
+        Same fields as calculate_ticker_sentiment, one row per ticker
+        data: DataFrame or SentimentRingStore
+        """
+        now = now or datetime.now()
+        if isinstance(data, SentimentRingStore):
+            ex = data.exploded(since=now - timedelta(days=7))
+        else:
+            ex = self.explode_tickers(data)
+        if len(ex) == 0:
+            return pd.DataFrame(columns=['overall_score', 'volume', 'momentum',
+                                         'platform_breakdown', 'unusual_activity',
+                                         'timestamp'])
+        grouped = ex.groupby('ticker')
+
+        # Weighted sentiment by platform, normalized over platforms present
+        platform_means = ex[ex['platform'].isin(self.platform_weights.keys())] \
+            .groupby(['ticker', 'platform'])['sentiment_score'].mean()
+        means = platform_means.unstack('platform')
+        weights = pd.Series(self.platform_weights).reindex(means.columns)
+        weighted = (means * weights).sum(axis=1)
+        total_weight = means.notna().mul(weights).sum(axis=1)
+        overall = (weighted / total_weight.where(total_weight > 0)).fillna(0.0)
+
+        breakdown = defaultdict(dict)
+        for (ticker, platform), value in platform_means.items():
+            breakdown[ticker][platform] = value
+
+        # Age of each mention relative to now, in hours
+        age = (now - ex['timestamp']) / timedelta(hours=1)
+
+        # Momentum: last 4 hours in 4 buckets, last valid minus first valid
+        in_window = (age >= 0) & (age < 4)
+        buckets = ex[in_window].assign(bucket=3 - np.floor(age[in_window])) \
+            .groupby(['ticker', 'bucket'])['sentiment_score'].mean().unstack('bucket')
+        first = buckets.bfill(axis=1).iloc[:, 0]
+        last = buckets.ffill(axis=1).iloc[:, -1]
+        momentum = (last - first).clip(-1.0, 1.0).where(buckets.notna().sum(axis=1) >= 2, 0.0)
+
+        # Unusual activity: last hour vs 7-day baseline
+        last_hour = ex[age < 1].groupby('ticker')['sentiment_score'].agg(['size', 'mean'])
+        week = ex[age < 7 * 24].groupby('ticker')['sentiment_score'].agg(['size', 'mean'])
+        last_hour = last_hour.reindex(week.index)
+        volume_spike = last_hour['size'].fillna(0) > (week['size'] / (7 * 24)) * 3
+        sentiment_divergence = (last_hour['mean'] - week['mean']).abs() > 0.5
+
+        tickers = grouped.size().index
+        result = pd.DataFrame({
+            'overall_score': overall.reindex(tickers, fill_value=0.0).round(3),
+            'volume': grouped.size(),
+            'momentum': momentum.reindex(tickers, fill_value=0.0).round(3),
+            'platform_breakdown': pd.Series({t: breakdown.get(t, {}) for t in tickers}),
+            'unusual_activity': (volume_spike | sentiment_divergence)
+                .reindex(tickers, fill_value=False).astype(bool),
+            'timestamp': now.isoformat()
+        })
+        result.index.name = 'ticker'
+        return result
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+import csv
+import os
+import string
+import struct
+import sys
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from aho_corasick import AhoCorasick, CompiledAhoCorasick
+
+# File layout (little-endian, sections 8-byte aligned):
+#   header        MAGIC, n_symbols, n_aliases, symbol_width, blob_len,
+#                 chars_len, n_nodes, n_delta, n_edges, n_outputs
+#   symbols       n_symbols x S<symbol_width>, sorted
+#   alias_offsets n_aliases + 1 x uint64, offsets into alias_blob
+#   alias_targets n_aliases x uint32, index into symbols
+#   alias_blob    lowercase UTF-8 aliases, sorted by bytes
+#   matcher       compiled automaton over symbols and aliases (see
+#                 AhoCorasick.compile), uint32 arrays in MATCHER_SECTIONS
+#                 order, then its character classes as UTF-8
+MAGIC = b'HSSATKR2'
+HEADER = struct.Struct('<8sIIIQIIIII')  # 48 bytes
+HEADER_SIZE = 48
+MATCHER_SECTIONS = ('delta', 'fail', 'edge_offsets', 'edge_classes', 'edge_targets',
+                    'out_offsets', 'out_lengths', 'out_values')
+
+# Lowercase ASCII only, so offsets in the lowered text match the original
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Matcher values: symbol index << 1 | kind
+MATCH_KINDS = ('symbol', 'company')
+
+def align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+def build_universe(csv_path: str, out_path: str) -> dict:
+    """
+    Compile a listings CSV into the on-disk ticker universe
+    CSV columns: symbol, name, aliases (optional, '|'-separated)
+    """
+    aliases = {}
+    symbols = set()
+    with open(csv_path, newline='') as f:
+        for row in csv.DictReader(f):
+            symbol = row['symbol'].strip().upper()
+            if not symbol:
+                continue
+            symbols.add(symbol)
+            names = [row.get('name') or ''] + (row.get('aliases') or '').split('|')
+            for name in names:
+                name = ' '.join(name.lower().split())
+                if name:
+                    aliases.setdefault(name.encode(), symbol)
+
+    symbol_list = sorted(symbols)
+    width = max((len(s) for s in symbol_list), default=1)
+    symbol_arr = np.array([s.encode() for s in symbol_list], dtype=f'S{width}')
+    symbol_index = {s: i for i, s in enumerate(symbol_list)}
+
+    alias_keys = sorted(aliases)
+    offsets = np.zeros(len(alias_keys) + 1, dtype='<u8')
+    offsets[1:] = np.cumsum([len(k) for k in alias_keys])
+    targets = np.array([symbol_index[aliases[k]] for k in alias_keys], dtype='<u4')
+    blob = b''.join(alias_keys)
+
+    # Symbols and company names in one automaton, compiled to flat arrays
+    # here so extractors map it instead of building a trie per process
+    matcher = AhoCorasick()
+    for i, symbol in enumerate(symbol_list):
+        matcher.add(symbol.translate(ASCII_LOWER), i << 1)
+    for key, target in zip(alias_keys, targets.tolist()):
+        matcher.add(key.decode(), target << 1 | 1)
+    matcher.build()
+    compiled = matcher.compile()
+    chars = compiled['chars'].encode()
+
+    # Write next to the target and swap in atomically, so running readers
+    # keep their (old) mapping and pick up the new file on reload
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(symbol_list), len(alias_keys), width, len(blob),
+                            len(chars), len(compiled['fail']), len(compiled['delta']),
+                            len(compiled['edge_targets']), len(compiled['out_values']))
+                .ljust(HEADER_SIZE, b'\0'))
+        sections = [symbol_arr.tobytes(), offsets.tobytes(), targets.tobytes(), blob]
+        sections += [compiled[name].tobytes() for name in MATCHER_SECTIONS]
+        for section in sections + [chars]:
+            f.write(section)
+            f.write(b'\0' * (align(f.tell()) - f.tell()))
+    os.replace(tmp_path, out_path)
+
+    return {'symbols': len(symbol_list), 'aliases': len(alias_keys),
+            'matcher_nodes': len(compiled['fail'])}
+
+class TickerUniverse:
+    """
+    Read-only, memory-mapped ticker/alias tables
+    All workers mapping the same file share its pages; lookups are binary
+    searches over the mapped arrays and the text matcher runs over the
+    compiled automaton in place, so loading does no parsing.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.load()
+
+    def load(self):
+        """Map the file and locate its sections"""
+        stat = os.stat(self.path)
+        self.file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self.buffer = np.memmap(self.path, dtype=np.uint8, mode='r')
+
+        if len(self.buffer) < HEADER_SIZE or self.buffer[:8].tobytes() != MAGIC:
+            raise ValueError(f"{self.path} is not a ticker universe file "
+                             f"(rebuild it with ticker_universe.py)")
+        (_, n_symbols, n_aliases, width, blob_len, chars_len,
+         n_nodes, n_delta, n_edges, n_outputs) = HEADER.unpack_from(
+            self.buffer[:HEADER.size].tobytes()
+        )
+
+        offset = HEADER_SIZE
+        self.symbols = self.buffer[offset:offset + n_symbols * width].view(f'S{width}')
+        offset = align(offset + n_symbols * width)
+        self.alias_offsets = self.buffer[offset:offset + (n_aliases + 1) * 8].view('<u8')
+        offset = align(offset + (n_aliases + 1) * 8)
+        self.alias_targets = self.buffer[offset:offset + n_aliases * 4].view('<u4')
+        offset = align(offset + n_aliases * 4)
+        self.alias_blob = self.buffer[offset:offset + blob_len]
+        offset = align(offset + blob_len)
+
+        # Matcher arrays as uint32 memoryviews: indexing them yields plain
+        # ints, which keeps the per-character loop fast (little-endian hosts)
+        sizes = {'delta': n_delta, 'fail': n_nodes, 'edge_offsets': n_nodes + 1,
+                 'edge_classes': n_edges, 'edge_targets': n_edges,
+                 'out_offsets': n_nodes + 1, 'out_lengths': n_outputs,
+                 'out_values': n_outputs}
+        arrays = {}
+        for name in MATCHER_SECTIONS:
+            arrays[name] = memoryview(self.buffer[offset:offset + sizes[name] * 4]).cast('I')
+            offset = align(offset + sizes[name] * 4)
+        chars = self.buffer[offset:offset + chars_len].tobytes().decode()
+        self.matcher = CompiledAhoCorasick(chars, decode=self.decode_match, **arrays)
+
+    def changed(self) -> bool:
+        """Whether the file on disk was replaced since it was mapped"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self.file_id
+
+    def reload_if_changed(self) -> bool:
+        """Remap the file if it changed; returns True on reload"""
+        if not self.changed():
+            return False
+        self.load()
+        return True
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol) -> bool:
+        if not isinstance(symbol, str):
+            return False
+        key = symbol.encode()
+        i = np.searchsorted(self.symbols, key)
+        return i < len(self.symbols) and self.symbols[i] == key
+
+    def __iter__(self) -> Iterator[str]:
+        for symbol in self.symbols:
+            yield symbol.decode()
+
+    def decode_match(self, value: int) -> Tuple[str, str]:
+        """(kind, ticker) for a matcher value"""
+        return MATCH_KINDS[value & 1], self.symbols[value >> 1].decode()
+
+    def alias(self, i: int) -> bytes:
+        return self.alias_blob[self.alias_offsets[i]:self.alias_offsets[i + 1]].tobytes()
+
+    def lookup_alias(self, name: str) -> Optional[str]:
+        """Ticker for a company name/alias (case-insensitive), or None"""
+        key = ' '.join(name.lower().split()).encode()
+        lo, hi = 0, len(self.alias_targets)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.alias(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.alias_targets) and self.alias(lo) == key:
+            return self.symbols[self.alias_targets[lo]].decode()
+        return None
+
+    def aliases(self) -> Iterator[Tuple[str, str]]:
+        """Iterate (alias, ticker) pairs"""
+        for i in range(len(self.alias_targets)):
+            yield self.alias(i).decode(), self.symbols[self.alias_targets[i]].decode()
+
+class AliasMap:
+    """
+    Mapping-style view of a TickerUniverse's alias index
+    Stands in for the company_to_ticker dict without copying it
+    """
+    def __init__(self, universe: TickerUniverse):
+        self.universe = universe
+
+    def __len__(self):
+        return len(self.universe.alias_targets)
+
+    def __getitem__(self, name: str) -> str:
+        ticker = self.universe.lookup_alias(name)
+        if ticker is None:
+            raise KeyError(name)
+        return ticker
+
+    def get(self, name: str, default=None):
+        ticker = self.universe.lookup_alias(name)
+        return default if ticker is None else ticker
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        return self.universe.aliases()
+
+if __name__ == '__main__':
+    # Usage: python ticker_universe.py listings.csv ticker_universe.bin
+    print(build_universe(sys.argv[1], sys.argv[2]))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+class AuthorWindow:
+    """
+    Sliding-window post counter for one author (ring of time buckets)
+    """
+    __slots__ = ('counts', 'head', 'total', 'last_seen')
+
+    def __init__(self, n_buckets: int):
+        self.counts = array('I', bytes(4 * n_buckets))
+        self.head = None  # Newest bucket number
+        self.total = 0  # Posts in the window
+        self.last_seen = 0.0
+
+class PostingVelocityTracker:
+    """
+    Constant-time, bounded-memory posting velocity per (platform, author)
+    Each author keeps a fixed ring of bucket counts covering the window.
+    Idle authors are evicted a few at a time on every post (LRU order), and
+    the number of tracked authors is capped.
+    """
+    def __init__(self, window_seconds: float = 3600, n_buckets: int = 12,
+                 default_threshold: int = 50, thresholds: Optional[dict] = None,
+                 idle_seconds: float = None, max_authors: int = 1_000_000,
+                 evictions_per_post: int = 4):
+        self.window_seconds = window_seconds
+        self.n_buckets = n_buckets
+        self.bucket_seconds = window_seconds / n_buckets
+        # Max posts per window, per platform
+        self.default_threshold = default_threshold
+        self.thresholds = thresholds or {}
+        # Authors idle longer than the window have empty rings: safe to drop
+        self.idle_seconds = idle_seconds or window_seconds
+        self.max_authors = max_authors
+        self.evictions_per_post = evictions_per_post
+
+        self.windows = OrderedDict()  # (platform, author) -> AuthorWindow, LRU
+
+    def __len__(self):
+        return len(self.windows)
+
+    def record(self, author: str, platform: str = None, timestamp=None) -> int:
+        """Count a post; returns the author's posts within the window"""
+        now = self.to_seconds(timestamp)
+        key = (platform, author)
+
+        window = self.windows.get(key)
+        if window is None:
+            window = AuthorWindow(self.n_buckets)
+            self.windows[key] = window
+        else:
+            self.windows.move_to_end(key)
+
+        bucket = int(now // self.bucket_seconds)
+        if window.head is None:
+            window.head = bucket
+        elif bucket > window.head:
+            # Clear buckets that slid out of the window (at most n_buckets)
+            for b in range(window.head + 1, min(bucket, window.head + self.n_buckets) + 1):
+                slot = b % self.n_buckets
+                window.total -= window.counts[slot]
+                window.counts[slot] = 0
+            window.head = bucket
+        elif bucket <= window.head - self.n_buckets:
+            bucket = None  # Late post, already outside the window
+
+        if bucket is not None:
+            window.counts[bucket % self.n_buckets] += 1
+            window.total += 1
+        window.last_seen = max(window.last_seen, now)
+
+        self.evict(now)
+        return window.total
+
+    def is_too_fast(self, author: str, platform: str = None, timestamp=None) -> bool:
+        """Record a post and flag the author if over the platform threshold"""
+        count = self.record(author, platform, timestamp)
+        return count > self.thresholds.get(platform, self.default_threshold)
+
+    def evict(self, now: float):
+        """Amortized eviction of idle authors from the LRU end"""
+        cutoff = now - self.idle_seconds
+        for _ in range(self.evictions_per_post):
+            if not self.windows:
+                break
+            key, window = next(iter(self.windows.items()))
+            if window.last_seen >= cutoff and len(self.windows) <= self.max_authors:
+                break
+            del self.windows[key]
+
+    def to_seconds(self, timestamp) -> float:
+        """Epoch seconds from a datetime/number (defaults to now)"""
+        if isinstance(timestamp, datetime):
+            return timestamp.timestamp()
+        if isinstance(timestamp, (int, float)):
+            return float(timestamp)
+        return time.time()